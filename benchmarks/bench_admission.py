@@ -0,0 +1,85 @@
+"""
+bench_admission.py
+
+Drives the IssueManager at 10x the agents' resolution capacity and compares intake latency, queueing
+delay and waitlist depth with and without admission control.
+
+Usage: python benchmarks/bench_admission.py [--ticks N] [--agents N] [--overload N]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from admission_control import AdmissionController, AdmissionRejected, AdmissionResult, LoadSheddingPolicy
+from agent_assignment_strategy import AgentAssignmentStrategy
+from agent_manager import AgentManager
+from issue_manager import IssueManager
+from issue_type import IssueType
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+def run(name, admission_controller, ticks, agent_count, overload):
+    issue_manager = IssueManager(dedup_window=None, admission_controller=admission_controller)
+    agent_manager = AgentManager()
+    strategy = AgentAssignmentStrategy(agent_manager, issue_manager)
+    agents = [agent_manager.add_agent(f"agent{i}@test.com", f"Agent {i}", [IssueType.PAYMENT_RELATED]) for i in range(agent_count)]
+
+    arrivals_per_tick = agent_count * overload
+    created_tick = {}
+    intake_latencies = {"first": [], "last": []}
+    queue_waits = []
+    shed = 0
+
+    for tick in range(ticks):
+        phase = "first" if tick < ticks // 10 else "last" if tick >= ticks - ticks // 10 else None
+        for i in range(arrivals_per_tick):
+            start = time.perf_counter()
+            try:
+                issue = issue_manager.create_issue(f"T{tick}-{i}", IssueType.PAYMENT_RELATED, "Payment Failed",
+                                                   "My payment failed but money is debited", f"user{i}@test.com")
+                created_tick[issue.issue_id] = tick
+                result = strategy.assign_issue(issue)
+                if result is not None and result != AdmissionResult.QUEUED:
+                    shed += 1
+            except AdmissionRejected:
+                shed += 1
+            if phase:
+                intake_latencies[phase].append(time.perf_counter() - start)
+
+        # Every agent resolves its issue once per tick and is handed the next waiting one
+        for agent in agents:
+            if agent.current_issue:
+                next_issue = issue_manager.resolve_issue(agent.current_issue.issue_id, "Refunded")
+                if next_issue:
+                    queue_waits.append(tick - created_tick[next_issue.issue_id])
+
+    waiting, deferred = issue_manager.get_waitlist_depth(IssueType.PAYMENT_RELATED)
+    print(f"{name:<18} intake p50/p99 first 10%: {percentile(intake_latencies['first'], 0.5) * 1e6:6.1f}/{percentile(intake_latencies['first'], 0.99) * 1e6:6.1f} us"
+          f"  last 10%: {percentile(intake_latencies['last'], 0.5) * 1e6:6.1f}/{percentile(intake_latencies['last'], 0.99) * 1e6:6.1f} us"
+          f"  queue wait p99: {percentile(queue_waits, 0.99):5.0f} ticks"
+          f"  waiting: {waiting + deferred:7d}  shed: {shed:7d}  stored: {len(issue_manager.issues):7d}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--overload", type=int, default=10, help="Arrival rate as a multiple of resolution capacity")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    waitlist_limit = args.agents * 5
+    run("unbounded", None, args.ticks, args.agents, args.overload)
+    run("reject", AdmissionController(default_waitlist_limit=waitlist_limit), args.ticks, args.agents, args.overload)
+    for name, policy in (("defer", LoadSheddingPolicy.DEFER), ("auto-acknowledge", LoadSheddingPolicy.AUTO_ACKNOWLEDGE)):
+        run(name, AdmissionController(default_waitlist_limit=waitlist_limit, shedding_policy=policy, overflow_limit=waitlist_limit),
+            args.ticks, args.agents, args.overload)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+bench_startup.py
+
+Measures cold and warm start times for a large agent and user roster, comparing the original
+one-agent-at-a-time loader with the streaming bulk loader and the binary roster snapshot.
+
+Usage: python benchmarks/bench_startup.py [--agents N] [--users N]
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from agent_manager import AgentManager
+from factory import UserFactory
+from issue_type import IssueType
+from roster_loader import load_roster
+
+def write_roster(path, agent_count, user_count):
+    issue_types = IssueType.all_types()
+    data = {
+        "agents": [
+            {"email": f"agent{i}@test.com", "name": f"Agent {i}", "expertise": [issue_types[i % 4], issue_types[(i + 1) % 4]]}
+            for i in range(agent_count)
+        ],
+        "users": [{"email": f"user{i}@test.com", "name": f"User {i}"} for i in range(user_count)],
+    }
+    with open(path, "w") as file:
+        json.dump(data, file, indent=4)
+
+def load_one_by_one(path):
+    # The loader main.py used before bulk loading: json.load, then add_agent and create_user per entry
+    with open(path, "r") as file:
+        data = json.load(file)
+    agent_manager = AgentManager()
+    for agent_data in data["agents"]:
+        agent_manager.add_agent(agent_data["email"], agent_data["name"], agent_data["expertise"])
+        logging.info(f"Agent {agent_data['name']} added.")
+    for user_data in data["users"]:
+        UserFactory.create_user(user_data["email"], user_data["name"])
+        logging.info(f"User {user_data['name']} created.")
+
+def timed(label, function):
+    gc.collect()  # Do not charge a run for collecting the previous run's managers
+    start = time.perf_counter()
+    function()
+    print(f"{label:<32} {time.perf_counter() - start:8.3f} s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--agents", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=100000)
+    args = parser.parse_args()
+
+    # Keep INFO logging enabled, as in production, but discard the output
+    logging.root.handlers = [logging.StreamHandler(open(os.devnull, "w"))]
+    logging.root.setLevel(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as directory:
+        roster_path = os.path.join(directory, "roster.json")
+        snapshot_path = os.path.join(directory, "roster.bin")
+        write_roster(roster_path, args.agents, args.users)
+        print(f"Roster: {args.agents} agents, {args.users} users, {os.path.getsize(roster_path) / 1e6:.1f} MB")
+
+        timed("one-by-one (original)", lambda: load_one_by_one(roster_path))
+        timed("streaming bulk load", lambda: load_roster(AgentManager(), path=roster_path))
+        timed("cold start, writing snapshot", lambda: load_roster(AgentManager(), path=roster_path, snapshot_path=snapshot_path))
+        timed("warm start from snapshot", lambda: load_roster(AgentManager(), path=roster_path, snapshot_path=snapshot_path))
+
+if __name__ == "__main__":
+    main()
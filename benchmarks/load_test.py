@@ -0,0 +1,105 @@
+"""
+load_test.py
+
+Loopback load-test client for the HTTP/JSON issue service. Each simulated client keeps one keep-alive
+connection open and sends a mix of create_issue and get_issues requests; the run reports requests/sec
+and latency percentiles.
+
+Usage:
+  python benchmarks/load_test.py                      # starts an in-process service on a free port
+  python benchmarks/load_test.py --port 8080          # targets a service started with src/service.py
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from agent_assignment_strategy import AgentAssignmentStrategy
+from agent_manager import AgentManager
+from factory import UserFactory
+from issue_manager import IssueManager
+from issue_type import IssueType
+from roster_loader import load_roster
+from service import IssueService
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+async def run_client(client_id, host, port, requests, read_ratio, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    issue_types = IssueType.all_types()
+    try:
+        for i in range(requests):
+            if i % 100 < read_ratio * 100:
+                request = f"GET /issues?email=user{client_id}%40test.com&status=Waiting HTTP/1.1\r\nHost: {host}\r\n\r\n".encode()
+            else:
+                body = json.dumps({
+                    "transaction_id": f"T{client_id}-{i}", "issue_type": issue_types[i % len(issue_types)],
+                    "subject": "Payment Failed", "description": "My payment failed but money is debited",
+                    "email": f"user{client_id}@test.com",
+                }).encode()
+                request = f"POST /issues HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+async def run(args):
+    service = None
+    port = args.port
+    if port is None:
+        issue_manager = IssueManager()
+        agent_manager = AgentManager()
+        load_roster(agent_manager, UserFactory)
+        service = IssueService(issue_manager, agent_manager, AgentAssignmentStrategy(agent_manager, issue_manager))
+        port = await service.start(args.host, 0)
+
+    latencies = []
+    statuses = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_client(client_id, args.host, port, args.requests, args.read_ratio, latencies, statuses)
+        for client_id in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(latencies)} requests from {args.clients} keep-alive clients in {elapsed:.2f} s: {len(latencies) / elapsed:,.0f} requests/sec")
+    print(f"latency p50 {percentile(latencies, 0.5) * 1e3:.2f} ms, p95 {percentile(latencies, 0.95) * 1e3:.2f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1e3:.2f} ms, max {max(latencies) * 1e3:.2f} ms")
+    print(f"status codes: {dict(sorted(statuses.items()))}")
+    if service is not None:
+        print(f"server batches: {service.batches}, mean batch size {service.operations / max(1, service.batches):.1f}")
+        await service.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Loopback load test for the issue service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="Port of a running service; omit to start one in-process")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per client")
+    parser.add_argument("--read-ratio", type=float, default=0.5, help="Fraction of requests that are get_issues")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
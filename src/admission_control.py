@@ -0,0 +1,185 @@
+"""
+admission_control.py
+
+Implements admission control for issue intake: per-user rate limits, bounded waitlists and load shedding.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+
+class LoadSheddingPolicy(Enum):
+    """
+    Enum representing what happens to an issue that arrives when its waitlist is full.
+    """
+    REJECT = "Reject"  # Raise AdmissionRejected so the caller can back off
+    DEFER = "Defer"  # Park the issue in overflow storage until the waitlist has room
+    AUTO_ACKNOWLEDGE = "Auto Acknowledge"  # Defer the issue and reply to the customer with an acknowledgement
+
+class AdmissionResult(Enum):
+    """
+    Enum representing the outcome of waitlisting an issue.
+    """
+    QUEUED = "Queued"
+    DEFERRED = "Deferred"
+    AUTO_ACKNOWLEDGED = "Auto Acknowledged"
+
+class AdmissionRejected(Exception):
+    """
+    Raised when intake is refused; carries a hint for when the caller may retry.
+    """
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """
+    Token bucket allowing bursts of up to `capacity` requests and `rate` requests per second on average.
+    """
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def try_acquire(self, now):
+        """
+        Takes one token if available.
+
+        :param now: The current time in seconds
+        :return: 0 if a token was taken, otherwise the number of seconds until one is available
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+class AdmissionController:
+    """
+    Decides whether new work is admitted to the IssueManager. With the defaults, everything is admitted.
+    """
+    AUTO_ACKNOWLEDGE_MESSAGE = "We have received your request and will get back to you shortly"
+    MAX_TRACKED_USERS = 100000  # Least recently seen users beyond this lose their bucket (it would be full)
+    DEFAULT_DEQUEUE_INTERVAL = 1.0  # Assumed seconds between waitlist dequeues before any have been observed
+    DEQUEUE_SMOOTHING = 0.2  # Weight of the latest interval in the moving average
+    MAX_RETRY_AFTER = 300.0  # Upper bound on the retry hint for full waitlists, in seconds
+
+    def __init__(self, waitlist_limits=None, default_waitlist_limit=None, user_rate=None, user_burst=None,
+                 shedding_policy=LoadSheddingPolicy.REJECT, overflow_limit=None, clock=time.monotonic):
+        """
+        Initializes the admission controller.
+
+        :param waitlist_limits: Optional dictionary mapping IssueType to the maximum number of waiting issues
+        :param default_waitlist_limit: Waitlist bound for issue types missing from waitlist_limits, or None for unbounded
+        :param user_rate: Issues per second each email may raise on average, or None for no rate limit
+        :param user_burst: Number of issues each email may raise in a burst; defaults to max(1, user_rate)
+        :param shedding_policy: LoadSheddingPolicy applied when a waitlist is full
+        :param overflow_limit: Maximum number of deferred issues per issue type, or None for unbounded; once it is
+                               reached, DEFER and AUTO_ACKNOWLEDGE reject like REJECT
+        :param clock: Callable returning the current time in seconds
+        """
+        self.waitlist_limits = dict(waitlist_limits or {})
+        self.default_waitlist_limit = default_waitlist_limit
+        self.user_rate = user_rate
+        self.user_burst = user_burst if user_burst is not None else max(1, user_rate or 0)
+        self.shedding_policy = shedding_policy
+        self.overflow_limit = overflow_limit
+        self.clock = clock
+        self.buckets = OrderedDict()  # email -> TokenBucket, least recently seen first
+        self.dequeue_intervals = {}  # issue_type -> (average seconds between dequeues or None, last dequeue time)
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def check_rate(self, email):
+        """
+        Consumes one unit of the user's rate limit.
+
+        :param email: Email of the user raising an issue
+        :raises AdmissionRejected: If the user exceeded their rate limit
+        """
+        if self.user_rate is None:
+            return
+        with self.lock:
+            now = self.clock()
+            bucket = self.buckets.get(email)
+            if bucket is None:
+                bucket = self.buckets[email] = TokenBucket(self.user_rate, self.user_burst, now)
+                if len(self.buckets) > self.MAX_TRACKED_USERS:
+                    self.buckets.popitem(last=False)
+            else:
+                self.buckets.move_to_end(email)
+            retry_after = bucket.try_acquire(now)
+            if retry_after:
+                self.rejected += 1
+                raise AdmissionRejected(f"Rate limit exceeded for {email}", retry_after)
+
+    def waitlist_limit(self, issue_type):
+        """
+        Returns the waitlist bound for an issue type, or None if it is unbounded.
+
+        :param issue_type: The IssueType
+        """
+        return self.waitlist_limits.get(issue_type, self.default_waitlist_limit)
+
+    def has_waitlist_room(self, issue_type, waiting_count):
+        """
+        Checks whether another issue of the given type may join the waitlist.
+
+        :param issue_type: The IssueType
+        :param waiting_count: Number of issues of that type currently waiting
+        :return: True if the issue may be queued
+        """
+        limit = self.waitlist_limit(issue_type)
+        return limit is None or waiting_count < limit
+
+    def has_overflow_room(self, deferred_count):
+        """
+        Checks whether another issue may be deferred to overflow storage.
+
+        :param deferred_count: Number of issues of the same type currently deferred
+        :return: True if the issue may be deferred
+        """
+        return self.overflow_limit is None or deferred_count < self.overflow_limit
+
+    def record_dequeue(self, issue_type):
+        """
+        Records that an issue left a waitlist, to estimate how fast each waitlist drains.
+
+        :param issue_type: The IssueType of the dequeued issue
+        """
+        with self.lock:
+            now = self.clock()
+            average, last = self.dequeue_intervals.get(issue_type, (None, None))
+            if last is not None:
+                interval = now - last
+                average = interval if average is None else average + self.DEQUEUE_SMOOTHING * (interval - average)
+            self.dequeue_intervals[issue_type] = (average, now)
+
+    def waitlist_retry_after(self, issue_type, waiting_count):
+        """
+        Estimates when a full waitlist will have drained, from its depth and its recent dequeue rate.
+
+        :param issue_type: The IssueType
+        :param waiting_count: Number of issues of that type currently waiting
+        :return: Seconds after which the caller may retry
+        """
+        with self.lock:
+            average = self.dequeue_intervals.get(issue_type, (None, None))[0]
+        if average is None:
+            average = self.DEFAULT_DEQUEUE_INTERVAL
+        return min(self.MAX_RETRY_AFTER, max(1, waiting_count) * average)
+
+    def reject_waitlist(self, issue_type, waiting_count):
+        """
+        Signals that a waitlist is full under the REJECT policy.
+
+        :param issue_type: The IssueType whose waitlist is full
+        :param waiting_count: Number of issues of that type currently waiting
+        :raises AdmissionRejected: Always, with a retry hint based on the waitlist depth
+        """
+        with self.lock:
+            self.rejected += 1
+        raise AdmissionRejected(f"Waitlist for {issue_type} is full", self.waitlist_retry_after(issue_type, waiting_count))
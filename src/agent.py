@@ -33,15 +33,33 @@ class Agent(IAgent):
         :param name: The name of the agent
         :param expertise: A list of IssueType instances that the agent is expert in
         """
-        self.agent_id = str(uuid.uuid4())
+        self._init_state(email, name, expertise)
+        logging.info(f"Agent {self.name} created with expertise in {', '.join(self.expertise)}")
+
+    @classmethod
+    def from_roster(cls, email, name, expertise, agent_id=None):
+        """
+        Creates an agent while bulk-loading a roster, without the per-agent log line.
+
+        :param email: The email address of the agent
+        :param name: The name of the agent
+        :param expertise: A list of IssueType instances that the agent is expert in
+        :param agent_id: Optional ID to restore; a new one is generated by default
+        :return: The created Agent object
+        """
+        agent = cls.__new__(cls)
+        agent._init_state(email, name, expertise, agent_id)
+        return agent
+
+    def _init_state(self, email, name, expertise, agent_id=None):
+        self.agent_id = agent_id or str(uuid.uuid4())
         self.name = name
         self.email = email
         self.expertise = expertise  # List of IssueType instances
         self.current_issue = None
         self.work_history = []
         self.status = AgentStatus.FREE
-        
-        logging.info(f"Agent {self.name} created with expertise in {', '.join(self.expertise)}")
+        self.listeners = []  # Callables notified as listener(agent, attribute, old_value, new_value)
 
     def assign_issue(self, issue):
         """
@@ -53,6 +71,7 @@ class Agent(IAgent):
             self.current_issue = issue
             self.status = AgentStatus.BUSY
             self.work_history.append(issue)
+            self._notify("status", AgentStatus.FREE, AgentStatus.BUSY)
             issue.assign_to_agent(self)
             logging.info(f"Issue {issue.issue_id} assigned to agent {self.name}")
         else:
@@ -69,5 +88,18 @@ class Agent(IAgent):
             self.status = AgentStatus.FREE
             logging.info(f"Agent {self.name} resolved issue {self.current_issue.issue_id}")
             self.current_issue = None
+            self._notify("status", AgentStatus.BUSY, AgentStatus.FREE)
         else:
             raise Exception(f"Agent {self.name} has no current issue to resolve")
+
+    def add_listener(self, listener):
+        """
+        Registers a callable to be notified when an attribute of the agent changes.
+
+        :param listener: Callable invoked as listener(agent, attribute, old_value, new_value)
+        """
+        self.listeners.append(listener)
+
+    def _notify(self, attribute, old_value, new_value):
+        for listener in self.listeners:
+            listener(self, attribute, old_value, new_value)
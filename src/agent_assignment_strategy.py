@@ -27,19 +27,26 @@ class AgentAssignmentStrategy(IAgentAssignmentStrategy):
     def assign_issue(self, issue):
         """
         Assigns an issue to a free agent with the appropriate expertise. If no agent is available, the issue is waitlisted.
+        Follow-up issues coalesced into an open primary issue are not assigned.
 
         :param issue: The Issue object to be assigned
+        :return: The AdmissionResult if the issue was waitlisted, otherwise None
         """
+        if issue.duplicate_of:
+            logging.info(f"Issue {issue.issue_id} is a follow-up of issue {issue.duplicate_of}; skipping assignment")
+            return None
         free_agents = self.agent_manager.get_free_agents(issue.issue_type)
         if free_agents:
             # Sort agents by the number of issues they've resolved (least first)
             free_agents.sort(key=lambda agent: len(agent.work_history))
             agent = free_agents[0]
-            agent.assign_issue(issue)
+            self.issue_manager.assign_issue_to_agent(issue, agent)
             logging.info(f"Issue {issue.issue_id} assigned to agent {agent.name}")
         else:
-            self.issue_manager.add_to_waitlist(issue)
-            logging.info(f"No free agents available; Issue {issue.issue_id} added to waitlist")
+            result = self.issue_manager.add_to_waitlist(issue)
+            logging.info(f"No free agents available; Issue {issue.issue_id} waitlist admission: {result.value}")
+            return result
+        return None
 
     def reassign_waiting_issues(self):
         """
@@ -4,8 +4,12 @@ agent_manager.py
 Manages the collection of agents and their assignments.
 """
 
+import threading
+from collections import defaultdict
 from interfaces import IAgentManager
 from agent import Agent, AgentStatus
+from event_stream import EventType
+from snapshot import AgentSnapshot, VersionedRecords, agent_record
 import logging
 
 # Configure logging
@@ -15,8 +19,17 @@ class AgentManager(IAgentManager):
     """
     Manages the collection of agents and their assignments.
     """
-    def __init__(self):
+    def __init__(self, event_stream=None):
+        """
+        Initializes the AgentManager.
+
+        :param event_stream: Optional EventStream to which agent free/busy changes are published
+        """
         self.agents = {}
+        self.agents_by_expertise = defaultdict(dict)  # issue_type -> {agent_id: Agent}
+        self.event_stream = event_stream
+        self.lock = threading.Lock()  # Guards the agent records
+        self.records = VersionedRecords()  # agent_id -> immutable AgentRecord, versioned on every change
 
     def add_agent(self, email, name, expertise):
         """
@@ -28,10 +41,48 @@ class AgentManager(IAgentManager):
         :return: The created Agent object
         """
         agent = Agent(email, name, expertise)
-        self.agents[agent.agent_id] = agent
+        self._register_agents([agent])
         logging.info(f"Agent {name} added to the system with ID {agent.agent_id}")
         return agent
 
+    def add_agents(self, agent_rows, agent_ids=None):
+        """
+        Adds agents in bulk, building the agent and expertise indexes in one pass with a single log line.
+
+        :param agent_rows: Sequence of (email, name, expertise) tuples
+        :param agent_ids: Optional sequence of agent IDs to restore, parallel to agent_rows
+        :return: A list of the created Agent objects
+        """
+        if agent_ids is None:
+            agents = [Agent.from_roster(email, name, list(expertise)) for email, name, expertise in agent_rows]
+        else:
+            agents = [Agent.from_roster(email, name, list(expertise), agent_id)
+                      for agent_id, (email, name, expertise) in zip(agent_ids, agent_rows)]
+        self._register_agents(agents)
+        logging.info(f"Added {len(agents)} agents to the system")
+        return agents
+
+    def _register_agents(self, agents):
+        with self.lock:
+            for agent in agents:
+                self.agents[agent.agent_id] = agent
+                for issue_type in agent.expertise:
+                    self.agents_by_expertise[issue_type][agent.agent_id] = agent
+                self.records.put(agent.agent_id, agent_record(agent))
+                agent.add_listener(self._on_agent_change)
+
+    def _on_agent_change(self, agent, attribute, old_value, new_value):
+        """
+        Listener registered on every managed agent. Refreshes the agent's record and publishes
+        free/busy transitions to the event stream.
+        """
+        with self.lock:
+            self.records.put(agent.agent_id, agent_record(agent))
+        if attribute == "status" and self.event_stream is not None:
+            event_type = EventType.AGENT_BUSY if new_value == AgentStatus.BUSY else EventType.AGENT_FREE
+            current_issue_id = agent.current_issue.issue_id if agent.current_issue else None
+            self.event_stream.publish(event_type, agent.agent_id, name=agent.name, current_issue_id=current_issue_id)
+
     def get_free_agents(self, issue_type):
         """
         Returns a list of agents who are free and have the required expertise.
@@ -39,7 +90,7 @@ class AgentManager(IAgentManager):
         :param issue_type: The type of issue requiring expertise
         :return: A list of free agents with the required expertise
         """
-        free_agents = [agent for agent in self.agents.values() if agent.status == AgentStatus.FREE and issue_type in agent.expertise]
+        free_agents = [agent for agent in self.agents_by_expertise.get(issue_type, {}).values() if agent.status == AgentStatus.FREE]
         logging.info(f"Found {len(free_agents)} free agents with expertise in {issue_type}")
         return free_agents
 
@@ -52,14 +103,22 @@ class AgentManager(IAgentManager):
         """
         return self.agents.get(agent_id)
 
+    def snapshot(self):
+        """
+        Returns a point-in-time view of all agents that is not affected by later changes.
+
+        :return: An AgentSnapshot
+        """
+        with self.lock:
+            return AgentSnapshot(self.records)
+
     def view_agents_work_history(self):
         """
         Returns the work history of all agents.
 
         :return: A dictionary mapping agent names to their resolved issues
         """
-        history = {}
-        for agent in self.agents.values():
-            history[agent.name] = [issue.issue_id for issue in agent.work_history]
+        # Built from a snapshot so that the report does not hold the lock while walking every agent
+        history = self.snapshot().view_agents_work_history()
         logging.info("Retrieved agents' work history")
         return history
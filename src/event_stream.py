@@ -0,0 +1,118 @@
+"""
+event_stream.py
+
+Implements a bounded, sequence-numbered change-data-capture stream of issue and agent state changes.
+"""
+
+import threading
+import time
+from collections import namedtuple
+from enum import Enum
+
+class EventType(Enum):
+    """
+    Enum representing the kinds of state change published to the event stream.
+    """
+    ISSUE_CREATED = "Issue Created"
+    ISSUE_REJECTED = "Issue Rejected"
+    ISSUE_WAITLISTED = "Issue Waitlisted"
+    ISSUE_ASSIGNED = "Issue Assigned"
+    ISSUE_STATUS_UPDATED = "Issue Status Updated"
+    ISSUE_RESOLVED = "Issue Resolved"
+    AGENT_BUSY = "Agent Busy"
+    AGENT_FREE = "Agent Free"
+
+ChangeEvent = namedtuple("ChangeEvent", ["sequence", "event_type", "entity_id", "data", "timestamp"])
+
+class SubscriptionDropped(Exception):
+    """
+    Raised when a subscriber fell so far behind that events it had not read were overwritten.
+    """
+
+class EventStream:
+    """
+    Ring buffer of ChangeEvents. Publishing never waits for subscribers: once the buffer is full the
+    oldest events are overwritten, and subscribers that had not read them lag or are dropped.
+    """
+    def __init__(self, capacity=4096):
+        """
+        Initializes the event stream.
+
+        :param capacity: Number of most recent events retained for subscribers
+        """
+        self.capacity = capacity
+        self.buffer = [None] * capacity
+        self.next_sequence = 0
+        self.lock = threading.Lock()
+
+    def publish(self, event_type, entity_id, **data):
+        """
+        Appends an event to the stream.
+
+        :param event_type: The EventType
+        :param entity_id: ID of the issue or agent that changed
+        :param data: Plain values describing the change
+        :return: The sequence number of the event
+        """
+        with self.lock:
+            sequence = self.next_sequence
+            self.buffer[sequence % self.capacity] = ChangeEvent(sequence, event_type, entity_id, data, time.time())
+            self.next_sequence = sequence + 1
+        return sequence
+
+    def subscribe(self, from_beginning=False, drop_if_lagging=False):
+        """
+        Creates an independent subscription with its own cursor.
+
+        :param from_beginning: Start at the oldest retained event instead of the next published one
+        :param drop_if_lagging: Drop the subscription instead of skipping ahead when events were overwritten
+        :return: A Subscription
+        """
+        with self.lock:
+            start = self._oldest_sequence() if from_beginning else self.next_sequence
+        return Subscription(self, start, drop_if_lagging)
+
+    def _oldest_sequence(self):
+        return max(0, self.next_sequence - self.capacity)
+
+class Subscription:
+    """
+    A subscriber's position in an EventStream.
+    """
+    def __init__(self, stream, cursor, drop_if_lagging):
+        self.stream = stream
+        self.cursor = cursor  # Sequence number of the next event to read
+        self.drop_if_lagging = drop_if_lagging
+        self.missed = 0  # Number of events overwritten before this subscriber read them
+        self.dropped = False
+
+    def read(self, max_events=100):
+        """
+        Reads the next batch of events.
+
+        :param max_events: Maximum number of events to return
+        :return: A list of ChangeEvents in sequence order, empty if the subscriber is caught up
+        :raises SubscriptionDropped: If events were overwritten and the subscription drops lagging readers
+        """
+        if self.dropped:
+            raise SubscriptionDropped(f"Subscription dropped at sequence {self.cursor}")
+        stream = self.stream
+        with stream.lock:
+            oldest = stream._oldest_sequence()
+            if self.cursor < oldest:
+                if self.drop_if_lagging:
+                    self.dropped = True
+                    raise SubscriptionDropped(f"Subscription fell behind: events {self.cursor} to {oldest - 1} were overwritten")
+                self.missed += oldest - self.cursor
+                self.cursor = oldest
+            end = min(stream.next_sequence, self.cursor + max_events)
+            events = [stream.buffer[sequence % stream.capacity] for sequence in range(self.cursor, end)]
+        self.cursor = end
+        return events
+
+    @property
+    def lag(self):
+        """
+        Number of published events this subscriber has not read yet.
+        """
+        return self.stream.next_sequence - self.cursor
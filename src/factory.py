@@ -66,3 +66,15 @@ class UserFactory:
         user = User(email, name)
         logging.info(f"User created with email {email}")
         return user
+
+    @staticmethod
+    def create_users(user_rows):
+        """
+        Creates User instances in bulk with a single log line, for loading large rosters.
+
+        :param user_rows: Iterable of (email, name) tuples
+        :return: A list of the created User objects
+        """
+        users = [User.from_roster(email, name) for email, name in user_rows]
+        logging.info(f"Created {len(users)} users")
+        return users
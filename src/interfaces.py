@@ -27,7 +27,15 @@ class IIssueManager(ABC):
         pass
 
     @abstractmethod
-    def get_next_waiting_issue(self):
+    def get_next_waiting_issue(self, issue_types=None):
+        pass
+
+    @abstractmethod
+    def assign_issue_to_agent(self, issue, agent):
+        pass
+
+    @abstractmethod
+    def resolve_issue(self, issue_id, resolution):
         pass
 
 class IAgentManager(ABC):
@@ -4,6 +4,7 @@ issue.py
 Contains the Issue class which represents a customer issue, and the IssueStatus enum for tracking issue status.
 """
 
+import time
 import uuid
 import logging
 from enum import Enum
@@ -20,6 +21,11 @@ class IssueStatus(Enum):
     RESOLVED = "Resolved"
     WAITING = "Waiting"
 
+class InvalidStatusTransition(Exception):
+    """
+    Raised when an issue cannot be moved to the requested status without bypassing its lifecycle.
+    """
+
 class Issue:
     """
     Represents a customer issue.
@@ -43,6 +49,13 @@ class Issue:
         self.status = IssueStatus.OPEN
         self.resolution = None
         self.assigned_agent = None
+        self.duplicate_of = None  # ID of the primary issue, if this is a follow-up
+        self.follow_ups = []  # Duplicate issues attached to this one
+        self.sequence = None  # Creation order, assigned by the IssueManager
+        self.created_at = time.time()  # Wall-clock times in seconds since the epoch
+        self.assigned_at = None
+        self.resolved_at = None
+        self.listeners = []  # Callables notified as listener(issue, attribute, old_value, new_value)
         
         logging.info(f"Issue {self.issue_id} created by {email} with type {self.issue_type}")
 
@@ -54,16 +67,38 @@ class Issue:
         :param resolution: Optional resolution description
         """
         if self.status != status:  # Only update if the status is changed
-            self.status = status
+            # Each attribute is changed and notified on its own so that listeners see one change at a time
             if resolution:
-                self.resolution = resolution
+                self._set("resolution", resolution)
+            if status == IssueStatus.RESOLVED:
+                self._set("resolved_at", time.time())
+            self._set("status", status)
             logging.info(f"Issue {self.issue_id} status updated to {self.status.value}")
 
     def assign_to_agent(self, agent):
         """
-        Assigns the issue to a specific agent.
+        Assigns the issue to a specific agent and marks it as in progress.
 
         :param agent: The agent to whom the issue is assigned
         """
-        self.assigned_agent = agent
+        self._set("assigned_at", time.time())
+        self._set("assigned_agent", agent)
+        self.update_status(IssueStatus.IN_PROGRESS)
         logging.info(f"Issue {self.issue_id} assigned to agent {agent.name}")
+
+    def add_listener(self, listener):
+        """
+        Registers a callable to be notified when an attribute of the issue changes.
+
+        :param listener: Callable invoked as listener(issue, attribute, old_value, new_value)
+        """
+        self.listeners.append(listener)
+
+    def _set(self, attribute, value):
+        old_value = getattr(self, attribute)
+        setattr(self, attribute, value)
+        self._notify(attribute, old_value, value)
+
+    def _notify(self, attribute, old_value, new_value):
+        for listener in self.listeners:
+            listener(self, attribute, old_value, new_value)
@@ -0,0 +1,120 @@
+"""
+issue_cursor.py
+
+Implements lazily evaluated, resumable cursors over issues in creation order.
+"""
+
+import base64
+from bisect import bisect_right
+
+class IssueCursor:
+    """
+    Iterates lazily over the issues matching a filter, in creation order.
+
+    The cursor walks the IssueManager's creation log one entry at a time, so memory use is constant
+    regardless of the result size and issues created while iterating are picked up in order. The log is
+    read through the manager on every step: when the manager replaces it after removing issues, the cursor
+    finds its place again by sequence number, and issues removed from the manager are skipped.
+    Its token can be passed back to IssueManager.query_issues to resume after the last issue returned.
+    """
+    def __init__(self, issue_manager, filter=None, limit=None, offset=0, after=None):
+        """
+        Initializes the cursor.
+
+        :param issue_manager: The IssueManager whose issue_log (issues ordered by sequence number) is walked
+        :param filter: Optional dictionary of exact-match criteria (e.g., status, email)
+        :param limit: Maximum number of issues to yield, or None for no limit
+        :param offset: Number of matching issues to skip before yielding
+        :param after: Sequence number to resume after (keyset pagination), or None to start at the beginning
+        """
+        self.issue_manager = issue_manager
+        self.issue_log = issue_manager.issue_log
+        self.filter = dict(filter or {})
+        self.remaining = limit
+        self.skip = offset
+        self.last_sequence = after  # Last issue returned, for the token
+        self.visited_sequence = after  # Last issue examined, for finding the position in a replaced log
+        self.position = self._find_position()
+
+    def _find_position(self):
+        if self.visited_sequence is None:
+            return 0
+        return bisect_right(self.issue_log, self.visited_sequence, key=lambda issue: issue.sequence)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.remaining is not None and self.remaining <= 0:
+            raise StopIteration
+        while True:
+            if self.issue_manager.issue_log is not self.issue_log:
+                self.issue_log = self.issue_manager.issue_log
+                self.position = self._find_position()
+            try:
+                issue = self.issue_log[self.position]
+            except IndexError:
+                # Also covers the log shrinking between a length check and the lookup
+                raise StopIteration from None
+            self.position += 1
+            self.visited_sequence = issue.sequence
+            if self.issue_manager.issues.get(issue.issue_id) is not issue or not self._matches(issue):
+                continue
+            if self.skip:
+                self.skip -= 1
+                continue
+            self.last_sequence = issue.sequence
+            if self.remaining is not None:
+                self.remaining -= 1
+            return issue
+
+    def _matches(self, issue):
+        for key, value in self.filter.items():
+            if getattr(issue, key) != value:
+                return False
+        return True
+
+    def fetch(self, count):
+        """
+        Returns up to the given number of issues from the cursor.
+
+        :param count: Maximum number of issues to return
+        :return: A list of Issue objects; shorter than count once the cursor is exhausted
+        """
+        batch = []
+        for issue in self:
+            batch.append(issue)
+            if len(batch) >= count:
+                break
+        return batch
+
+    @property
+    def token(self):
+        """
+        Opaque token identifying the position after the last issue returned, or None if nothing was returned.
+        """
+        return None if self.last_sequence is None else encode_token(self.last_sequence)
+
+def encode_token(sequence):
+    """
+    Encodes a sequence number as an opaque cursor token.
+
+    :param sequence: The issue sequence number
+    :return: The cursor token string
+    """
+    return base64.urlsafe_b64encode(f"seq:{sequence}".encode()).decode()
+
+def decode_token(token):
+    """
+    Decodes a cursor token produced by encode_token.
+
+    :param token: The cursor token string
+    :return: The sequence number
+    """
+    try:
+        prefix, sequence = base64.urlsafe_b64decode(token.encode()).decode().split(":")
+        if prefix != "seq":
+            raise ValueError(prefix)
+        return int(sequence)
+    except ValueError:
+        raise ValueError(f"Invalid cursor token: {token}") from None
@@ -4,9 +4,18 @@ issue_manager.py
 Manages the collection of issues and their assignments, including retry logic for issue assignment.
 """
 
+import threading
+import time
 from collections import deque, defaultdict
 from interfaces import IIssueManager
-from issue import Issue, IssueStatus
+from issue import InvalidStatusTransition, Issue, IssueStatus
+from search_index import SearchIndex
+from issue_cursor import IssueCursor, decode_token
+from query_cache import QueryCache
+from admission_control import AdmissionController, AdmissionRejected, AdmissionResult, LoadSheddingPolicy
+from event_stream import EventType
+from snapshot import IssueSnapshot, VersionedRecords, issue_record
+from partitioned_store import TimePartitionedStore
 import logging
 
 # Configure logging
@@ -17,21 +26,57 @@ class IssueManager(IIssueManager):
     Manages the collection of issues and their assignments.
     """
     MAX_RETRY_COUNT = 5  # Maximum retries for assigning an issue
+    DEDUP_WINDOW_SECONDS = 15 * 60  # Window in which repeated issues are coalesced
+    QUERY_CACHE_SIZE = 256  # Maximum number of cached filter results
+    PARTITION_SECONDS = 60 * 60  # Width of the creation-time partitions
+    MIN_LOG_COMPACTION = 64  # Removed issues that may accumulate in the issue log before it is rebuilt
 
-    def __init__(self):
+    def __init__(self, dedup_window=DEDUP_WINDOW_SECONDS, query_cache_size=QUERY_CACHE_SIZE, admission_controller=None,
+                 event_stream=None, partition_seconds=PARTITION_SECONDS):
+        """
+        Initializes the IssueManager.
+
+        :param dedup_window: Seconds during which an issue with the same email, transaction ID and
+                             issue type is attached to the open primary issue instead of creating new work.
+                             Pass None to disable coalescing.
+        :param query_cache_size: Maximum number of filter results kept by the query cache
+        :param admission_controller: Optional AdmissionController; by default all work is admitted
+        :param event_stream: Optional EventStream to which every issue state change is published
+        :param partition_seconds: Width of the creation-time partitions used by time-range queries and compaction
+        """
+        self.lock = threading.RLock()  # Guards the issue collections, indexes and waitlist
         self.issues = {}
-        self.waiting_issues = deque()
+        self.issue_log = []  # List of issues in creation order, used by cursors; may hold removed issues until rebuilt
+        self.dead_log_entries = 0  # Number of removed issues still held by issue_log
+        self.partitions = TimePartitionedStore(partition_seconds)
+        self.next_sequence = 0
+        self.dedup_window = dedup_window
+        self.dedup_index = {}  # (email, transaction_id, issue_type) -> (primary Issue, creation time)
+        self.waiting_by_type = defaultdict(deque)  # issue_type -> deque of (arrival number, Issue)
+        self.queued_issue_ids = set()  # IDs of the issues with an entry in waiting_by_type
+        self.next_arrival = 0
+        self.waiting_counts = defaultdict(int)  # issue_type -> number of issues with status WAITING
+        self.overflow_by_type = defaultdict(deque)  # issue_type -> issues deferred while the waitlist was full
+        self.deferred_issue_ids = set()  # IDs of the issues with an entry in overflow_by_type
+        self.admission_controller = admission_controller or AdmissionController()
+        self.event_stream = event_stream
+        self.records = VersionedRecords()  # issue_id -> immutable IssueRecord, versioned on every change
         self.retry_count = defaultdict(int)
+        self.search_index = SearchIndex()
+        self.query_cache = QueryCache(query_cache_size)
+        # Status buckets map issue_id -> Issue and are kept up to date by the issue listener
         self.issues_by_status = {
-            IssueStatus.OPEN: [],
-            IssueStatus.IN_PROGRESS: [],
-            IssueStatus.RESOLVED: [],
-            IssueStatus.WAITING: []
+            IssueStatus.OPEN: {},
+            IssueStatus.IN_PROGRESS: {},
+            IssueStatus.RESOLVED: {},
+            IssueStatus.WAITING: {}
         }
 
     def create_issue(self, transaction_id, issue_type, subject, description, email):
         """
-        Creates a new issue and adds it to the issue list.
+        Creates a new issue and adds it to the issue list. If an open issue with the same email,
+        transaction ID and issue type was raised within the dedup window, the new issue is attached
+        to it as a follow-up and will not be assigned to an agent.
 
         :param transaction_id: ID of the transaction related to the issue
         :param issue_type: Type of the issue
@@ -39,13 +84,55 @@ class IssueManager(IIssueManager):
         :param description: Detailed description of the issue
         :param email: Email of the user who raised the issue
         :return: The created Issue object
+        :raises AdmissionRejected: If the user exceeded their rate limit
         """
+        self.admission_controller.check_rate(email)
         issue = Issue(transaction_id, issue_type, subject, description, email)
-        self.issues[issue.issue_id] = issue
-        self.issues_by_status[IssueStatus.OPEN].append(issue)
+        dedup_key = (email, transaction_id, issue_type)
+
+        with self.lock:
+            primary = self._find_open_duplicate(dedup_key)
+            issue.sequence = self.next_sequence
+            self.next_sequence += 1
+            self.issues[issue.issue_id] = issue
+            self.issue_log.append(issue)
+            self.partitions.add(issue)
+            self.issues_by_status[IssueStatus.OPEN][issue.issue_id] = issue
+            self.search_index.add(issue.issue_id, issue.subject, issue.description)
+
+            if primary:
+                issue.duplicate_of = primary.issue_id
+                primary.follow_ups.append(issue)
+                logging.info(f"Issue {issue.issue_id} attached as a follow-up to issue {primary.issue_id}")
+            elif self.dedup_window is not None:
+                self.dedup_index[dedup_key] = (issue, time.monotonic())
+
+            issue.add_listener(self._on_issue_change)
+            self.records.put(issue.issue_id, issue_record(issue))
+            self.query_cache.invalidate_matching(issue)
+            if self.event_stream is not None:
+                self.event_stream.publish(EventType.ISSUE_CREATED, issue.issue_id, transaction_id=transaction_id,
+                                          issue_type=issue_type, email=email, duplicate_of=issue.duplicate_of)
+
         logging.info(f"Issue {issue.issue_id} created and added to the system")
         return issue
 
+    def _find_open_duplicate(self, dedup_key):
+        """
+        Looks up the open primary issue for a dedup key, discarding stale index entries.
+
+        :param dedup_key: Tuple of (email, transaction_id, issue_type)
+        :return: The primary Issue object, or None if there is no open issue within the window
+        """
+        entry = self.dedup_index.get(dedup_key)
+        if entry is None:
+            return None
+        primary, created_at = entry
+        if primary.status != IssueStatus.RESOLVED and time.monotonic() - created_at < self.dedup_window:
+            return primary
+        del self.dedup_index[dedup_key]
+        return None
+
     def get_issue_by_id(self, issue_id):
         """
         Retrieves an issue by its ID.
@@ -62,67 +149,321 @@ class IssueManager(IIssueManager):
         :param filter: A dictionary containing filter criteria (e.g., status, email)
         :return: A list of issues that match the filter criteria
         """
+        cache_key = self.query_cache.make_key("issues", filter)
+        if cache_key is not None:
+            cached = self.query_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            generation = self.query_cache.generation
+
         filtered_issues = []
-        for issue in self.issues.values():
-            match = True
-            for key, value in filter.items():
-                if getattr(issue, key) != value:
-                    match = False
-                    break
-            if match:
-                filtered_issues.append(issue)
+        with self.lock:
+            for issue in self.issues.values():
+                match = True
+                for key, value in filter.items():
+                    if getattr(issue, key) != value:
+                        match = False
+                        break
+                if match:
+                    filtered_issues.append(issue)
         logging.info(f"Filtered issues based on criteria: {filter}")
+        if cache_key is not None:
+            self.query_cache.put(cache_key, filter, filtered_issues, generation)
         return filtered_issues
 
+    def get_issues_created_between(self, start=None, end=None, filter=None):
+        """
+        Retrieves the issues created in a time range, scanning only the partitions that overlap it.
+
+        :param start: Inclusive lower bound in seconds since the epoch, or None for no bound
+        :param end: Exclusive upper bound in seconds since the epoch, or None for no bound
+        :param filter: Optional dictionary of exact-match criteria, as accepted by get_issues
+        :return: A list of matching issues
+        """
+        with self.lock:
+            issues = self.partitions.get_range(start, end)
+        if filter:
+            issues = [issue for issue in issues if all(getattr(issue, key) == value for key, value in filter.items())]
+        logging.info(f"Found {len(issues)} issues created between {start} and {end} matching {filter}")
+        return issues
+
+    def compact_partitions(self, retention_seconds, now=None, archive=None):
+        """
+        Drops the resolved issues of every partition that ended more than retention_seconds ago.
+
+        Only the expired partitions are visited, and the query cache is flushed once per pass rather than per
+        issue. Dropped issues stay in the issue log until enough have accumulated to rebuild it, so a pass costs
+        amortized time proportional to the number of issues it drops. Unresolved issues are kept in their
+        partition until they are resolved.
+
+        :param retention_seconds: How long resolved issues are kept after their partition ends
+        :param now: Current time in seconds since the epoch; defaults to time.time()
+        :param archive: Optional callable invoked as archive(partition_start, issues) for every dropped partition
+        :return: The number of issues dropped
+        """
+        cutoff = (time.time() if now is None else now) - retention_seconds
+        with self.lock:
+            dropped = self.partitions.drop_expired(cutoff, keep=lambda issue: issue.status != IssueStatus.RESOLVED)
+            if not dropped:
+                return 0
+            removed_ids = set()
+            for _, issues in dropped:
+                for issue in issues:
+                    removed_ids.add(issue.issue_id)
+                    del self.issues[issue.issue_id]
+                    self.issues_by_status[IssueStatus.RESOLVED].pop(issue.issue_id, None)
+                    self.retry_count.pop(issue.issue_id, None)
+                    self.search_index.remove(issue.issue_id)
+                    issue.listeners.remove(self._on_issue_change)
+            self._remove_from_issue_log([issue for _, issues in dropped for issue in issues])
+            self.records.remove(removed_ids)
+            self.query_cache.invalidate_all()
+
+        if archive is not None:
+            for partition_start, issues in dropped:
+                archive(partition_start, issues)
+        logging.info(f"Compaction dropped {len(removed_ids)} resolved issues from {len(dropped)} partitions")
+        return len(removed_ids)
+
+    def query_issues(self, filter=None, limit=None, offset=0, cursor=None):
+        """
+        Returns a lazy cursor over the issues matching a filter, in creation order.
+
+        Unlike get_issues, no result list is built up front, so very large result sets can be streamed
+        with constant memory while other threads keep creating issues.
+
+        :param filter: Optional dictionary containing filter criteria (e.g., status, email)
+        :param limit: Maximum number of issues to return, or None for no limit
+        :param offset: Number of matching issues to skip
+        :param cursor: Token from a previous cursor to resume after its last issue
+        :return: An IssueCursor yielding Issue objects
+        """
+        after = decode_token(cursor) if cursor else None
+        return IssueCursor(self, filter, limit, offset, after)
+
+    def search_issues(self, query, filter=None, limit=20, offset=0):
+        """
+        Searches issue subjects and descriptions, optionally combined with structured filter criteria.
+
+        :param query: Search terms, prefixes (e.g. refu*) and quoted phrases (e.g. "money debited")
+        :param filter: Optional dictionary of exact-match criteria, as accepted by get_issues
+        :param limit: Maximum number of issues to return
+        :param offset: Number of ranked results to skip, for pagination
+        :return: A list of matching issues, best match first
+        """
+        candidates = None
+        if filter:
+            def candidates(issue_id):
+                issue = self.issues[issue_id]
+                return all(getattr(issue, key) == value for key, value in filter.items())
+
+        with self.lock:
+            results = self.search_index.search(query, candidates)
+            page = [self.issues[issue_id] for issue_id, _ in results[offset:offset + limit]]
+        logging.info(f"Search '{query}' with criteria {filter} matched {len(results)} issues")
+        return page
+
     def update_issue(self, issue_id, status, resolution=None):
         """
         Updates the status of an issue and optionally sets a resolution.
 
+        Status changes take the same path as the rest of the lifecycle: resolving goes through resolve_issue,
+        which frees the assigned agent and hands it the next waiting issue, and WAITING goes through the
+        waitlist. Only assigning an issue to an agent moves it to IN_PROGRESS, and an issue in progress
+        can only be resolved, so that its agent is never left working on an issue that moved on.
+
         :param issue_id: The unique ID of the issue
         :param status: The new status of the issue (IssueStatus enum)
         :param resolution: Optional resolution description
+        :raises InvalidStatusTransition: If the change would bypass agent assignment
+        :raises AdmissionRejected: If the issue is waitlisted while its waitlist is full and the policy is REJECT
         """
-        issue = self.get_issue_by_id(issue_id)
-        if issue:
-            old_status = issue.status
-            if issue in self.issues_by_status[old_status]:
-                self.issues_by_status[old_status].remove(issue)
-            
-            # Update the issue status
-            issue.update_status(status, resolution)
-            
-            # Add the issue to the appropriate status list
-            self.issues_by_status[status].append(issue)
-            logging.info(f"Issue {issue_id} updated with status {status.value}")
+        with self.lock:
+            issue = self.get_issue_by_id(issue_id)
+            if issue is None or issue.status == status:
+                return
+            if status == IssueStatus.RESOLVED:
+                self.resolve_issue(issue_id, resolution)
+            elif status == IssueStatus.IN_PROGRESS:
+                raise InvalidStatusTransition(f"Issue {issue_id} can only be moved to {status.value} by assigning it to an agent")
+            elif issue.status == IssueStatus.IN_PROGRESS:
+                raise InvalidStatusTransition(f"Issue {issue_id} is being worked on by an agent and can only be resolved")
+            elif status == IssueStatus.WAITING:
+                self._add_to_waitlist(issue, discard_rejected=False)
+            else:
+                # The status buckets, cache and waitlist counts are updated by the issue listener
+                issue.update_status(status, resolution)
+        logging.info(f"Issue {issue_id} updated with status {status.value}")
+
+    def _resolve_follow_ups(self, issue):
+        """
+        Resolves every follow-up attached to a resolved primary issue and drops it from the dedup index.
+
+        :param issue: The resolved primary Issue object
+        """
+        dedup_key = (issue.email, issue.transaction_id, issue.issue_type)
+        entry = self.dedup_index.get(dedup_key)
+        if entry and entry[0] is issue:
+            del self.dedup_index[dedup_key]
+
+        for follow_up in issue.follow_ups:
+            follow_up.update_status(IssueStatus.RESOLVED, issue.resolution)
+        if issue.follow_ups:
+            logging.info(f"Resolved {len(issue.follow_ups)} follow-ups of issue {issue.issue_id}")
 
     def add_to_waitlist(self, issue):
         """
         Adds an issue to the waitlist for later assignment and changes its status to WAITING.
 
+        If the waitlist for the issue type is full, the admission controller's load-shedding policy decides
+        whether the issue is rejected, deferred to overflow storage or deferred with an acknowledgement.
+        A rejected issue is removed from the system, so a retry of the same request starts afresh.
+
         :param issue: The Issue object to be waitlisted
+        :return: An AdmissionResult describing what happened to the issue
+        :raises AdmissionRejected: If the waitlist is full and the policy is REJECT
+        """
+        return self._add_to_waitlist(issue, discard_rejected=True)
+
+    def _add_to_waitlist(self, issue, discard_rejected):
         """
-        old_status = issue.status
-        if issue in self.issues_by_status[old_status]:
-            self.issues_by_status[old_status].remove(issue)
-        
+        :param discard_rejected: Whether a rejected OPEN issue is removed, as for new intake
+        """
+        with self.lock:
+            waiting_count = self.waiting_counts[issue.issue_type]
+            # An issue that is already waiting keeps its slot when it is put back after a failed reassignment
+            if issue.status == IssueStatus.WAITING or self.admission_controller.has_waitlist_room(issue.issue_type, waiting_count):
+                self._enqueue_waiting(issue)
+                logging.info(f"Issue {issue.issue_id} added to waitlist with status {IssueStatus.WAITING.value}")
+                return AdmissionResult.QUEUED
+
+            policy = self.admission_controller.shedding_policy
+            if policy in (LoadSheddingPolicy.DEFER, LoadSheddingPolicy.AUTO_ACKNOWLEDGE):
+                # An acknowledged issue stays open and is parked like a deferred one; only the reply to the customer differs
+                result = AdmissionResult.DEFERRED if policy == LoadSheddingPolicy.DEFER else AdmissionResult.AUTO_ACKNOWLEDGED
+                if issue.issue_id in self.deferred_issue_ids:
+                    return result
+                overflow = self.overflow_by_type[issue.issue_type]
+                # Drop issues that were resolved by other means while they were deferred
+                while overflow and overflow[0].status not in (IssueStatus.OPEN, IssueStatus.WAITING):
+                    self.deferred_issue_ids.discard(overflow.popleft().issue_id)
+                if self.admission_controller.has_overflow_room(len(overflow)):
+                    overflow.append(issue)
+                    self.deferred_issue_ids.add(issue.issue_id)
+                    logging.warning(f"Waitlist for {issue.issue_type} is full; issue {issue.issue_id} {result.value.lower()}")
+                    return result
+            if discard_rejected and issue.issue_id in self.issues and issue.status == IssueStatus.OPEN:
+                self._discard_issue(issue)
+        logging.warning(f"Waitlist for {issue.issue_type} is full; issue {issue.issue_id} rejected")
+        self.admission_controller.reject_waitlist(issue.issue_type, waiting_count)
+
+    def _discard_issue(self, issue):
+        """
+        Removes an issue that was refused admission, and its follow-ups, from every collection and index.
+
+        :param issue: The OPEN Issue object to remove
+        """
+        for follow_up in issue.follow_ups:
+            self._discard_issue(follow_up)
+        del self.issues[issue.issue_id]
+        self.records.remove([issue.issue_id])
+        self.issues_by_status[issue.status].pop(issue.issue_id, None)
+        self.retry_count.pop(issue.issue_id, None)
+        self.search_index.remove(issue.issue_id)
+        self.partitions.remove(issue)
+        issue.listeners.remove(self._on_issue_change)
+
+        dedup_key = (issue.email, issue.transaction_id, issue.issue_type)
+        entry = self.dedup_index.get(dedup_key)
+        if entry and entry[0] is issue:
+            del self.dedup_index[dedup_key]
+
+        self._remove_from_issue_log([issue])
+
+        self.query_cache.invalidate_matching(issue)
+        if self.event_stream is not None:
+            self.event_stream.publish(EventType.ISSUE_REJECTED, issue.issue_id, email=issue.email)
+
+    def _remove_from_issue_log(self, issues):
+        """
+        Accounts for issues that were removed from self.issues. They stay in the creation log, where cursors
+        skip them, until removed issues make up half of it; the log is then rebuilt without them, so removal
+        costs amortized constant time per issue. Open cursors resume in the new list by sequence number.
+
+        :param issues: The Issue objects removed from self.issues
+        """
+        self.dead_log_entries += len(issues)
+        if self.dead_log_entries < max(self.MIN_LOG_COMPACTION, len(self.issue_log) // 2):
+            return
+        self.issue_log = [logged for logged in self.issue_log if self.issues.get(logged.issue_id) is logged]
+        self.dead_log_entries = 0
+
+    def _enqueue_waiting(self, issue):
         issue.update_status(IssueStatus.WAITING)
-        self.issues_by_status[IssueStatus.WAITING].append(issue)
-        self.waiting_issues.append(issue)
-        logging.info(f"Issue {issue.issue_id} added to waitlist with status {IssueStatus.WAITING.value}")
+        if issue.issue_id in self.queued_issue_ids:
+            return
+        self.queued_issue_ids.add(issue.issue_id)
+        self.waiting_by_type[issue.issue_type].append((self.next_arrival, issue))
+        self.next_arrival += 1
+
+    def _promote_deferred(self, issue_type):
+        """
+        Moves deferred issues of a type back to the waitlist while it has room.
 
-    def get_next_waiting_issue(self):
+        :param issue_type: The IssueType whose waitlist freed up
         """
-        Retrieves the next issue from the waitlist for assignment.
+        overflow = self.overflow_by_type.get(issue_type)
+        while overflow and self.admission_controller.has_waitlist_room(issue_type, self.waiting_counts[issue_type]):
+            issue = overflow.popleft()
+            self.deferred_issue_ids.discard(issue.issue_id)
+            if issue.status in (IssueStatus.OPEN, IssueStatus.WAITING):
+                self._enqueue_waiting(issue)
+                logging.info(f"Deferred issue {issue.issue_id} moved to the waitlist")
 
+    def get_waitlist_depth(self, issue_type):
+        """
+        Returns the number of waiting and deferred issues of a type, for callers applying backpressure.
+
+        :param issue_type: The IssueType
+        :return: A tuple of (waiting count, deferred count)
+        """
+        with self.lock:
+            return self.waiting_counts[issue_type], len(self.overflow_by_type[issue_type])
+
+    def get_next_waiting_issue(self, issue_types=None):
+        """
+        Retrieves the longest-waiting issue from the waitlist for assignment.
+
+        :param issue_types: Optional list of issue types to consider, e.g. an agent's expertise
         :return: The next Issue object in the waitlist, if available
         """
-        if self.waiting_issues:
-            issue = self.waiting_issues.popleft()
-            logging.info(f"Issue {issue.issue_id} retrieved from waitlist for assignment")
-            return issue
-        else:
-            logging.info("No issues in waitlist")
-            return None
+        with self.lock:
+            next_queue = None
+            for issue_type in (self.waiting_by_type if issue_types is None else issue_types):
+                queue = self.waiting_by_type.get(issue_type)
+                # Drop issues that were assigned or resolved by other means while they were waiting
+                while queue and queue[0][1].status != IssueStatus.WAITING:
+                    self.queued_issue_ids.discard(queue.popleft()[1].issue_id)
+                if queue and (next_queue is None or queue[0][0] < next_queue[0][0]):
+                    next_queue = queue
+            if next_queue is not None:
+                _, issue = next_queue.popleft()
+                self.queued_issue_ids.discard(issue.issue_id)
+                self.admission_controller.record_dequeue(issue.issue_type)
+                logging.info(f"Issue {issue.issue_id} retrieved from waitlist for assignment")
+                return issue
+        logging.info("No issues in waitlist")
+        return None
+
+    def assign_issue_to_agent(self, issue, agent):
+        """
+        Assigns an issue to an agent and moves it to IN_PROGRESS in a single step.
+
+        :param issue: The Issue object to be assigned
+        :param agent: The free Agent with the required expertise
+        """
+        with self.lock:
+            agent.assign_issue(issue)
 
     def try_assign_issue(self, strategy, issue):
         """
@@ -130,18 +471,22 @@ class IssueManager(IIssueManager):
 
         :param strategy: The AgentAssignmentStrategy instance
         :param issue: The Issue object to be assigned
+        :return: The AdmissionResult if the issue was waitlisted, otherwise None
         """
         try:
-            strategy.assign_issue(issue)
+            return strategy.assign_issue(issue)
+        except AdmissionRejected:
+            # Backpressure is reported to the caller rather than retried
+            raise
         except Exception as e:
             self.retry_count[issue.issue_id] += 1
             logging.warning(f"Failed to assign issue {issue.issue_id}: {e}")
             if self.retry_count[issue.issue_id] < self.MAX_RETRY_COUNT:
                 logging.info(f"Retrying assignment for issue {issue.issue_id} (Attempt {self.retry_count[issue.issue_id]})")
-                self.try_assign_issue(strategy, issue)
+                return self.try_assign_issue(strategy, issue)
             else:
                 logging.error(f"Max retries reached for issue {issue.issue_id}. Adding to waiting status.")
-                self.add_to_waitlist(issue)
+                return self.add_to_waitlist(issue)
 
     def get_issues_by_status(self, status):
         """
@@ -150,14 +495,98 @@ class IssueManager(IIssueManager):
         :param status: The IssueStatus enum
         :return: A list of Issue objects with the specified status
         """
-        return self.issues_by_status[status]
+        criteria = {"status": status}
+        cache_key = self.query_cache.make_key("issues_by_status", criteria)
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        generation = self.query_cache.generation
+        # Return a copy so callers can iterate safely while the status buckets change
+        with self.lock:
+            issues = list(self.issues_by_status[status].values())
+        self.query_cache.put(cache_key, criteria, issues, generation)
+        return issues
+
+    def snapshot(self):
+        """
+        Returns a point-in-time view of all issues that is not affected by later changes.
+
+        The lock is held only to capture the current version of the records, which takes constant time;
+        queries against the snapshot then run without blocking intake or assignment.
+
+        :return: An IssueSnapshot
+        """
+        with self.lock:
+            return IssueSnapshot(self.records)
+
+    def get_cache_stats(self):
+        """
+        Returns hit-rate statistics for the filter result cache.
+
+        :return: A dictionary with hits, misses, hit_rate, size, evictions and invalidations
+        """
+        return self.query_cache.stats()
+
+    def _on_issue_change(self, issue, attribute, old_value, new_value):
+        """
+        Listener registered on every managed issue. Moves the issue between status buckets, evicts only
+        the cached results the change affects and resolves the follow-ups of resolved issues.
+        """
+        with self.lock:
+            if attribute == "status":
+                self.issues_by_status[old_value].pop(issue.issue_id, None)
+                self.issues_by_status[new_value][issue.issue_id] = issue
+                if new_value == IssueStatus.WAITING:
+                    self.waiting_counts[issue.issue_type] += 1
+            self.records.put(issue.issue_id, issue_record(issue))
+            self.query_cache.invalidate_attribute(issue, attribute, old_value, new_value)
+            if self.event_stream is not None:
+                self._publish_issue_change(issue, attribute, old_value, new_value)
+            if attribute == "status" and new_value == IssueStatus.RESOLVED:
+                self._resolve_follow_ups(issue)
+            if attribute == "status" and old_value == IssueStatus.WAITING:
+                self.waiting_counts[issue.issue_type] -= 1
+                self._promote_deferred(issue.issue_type)
+
+    def _publish_issue_change(self, issue, attribute, old_value, new_value):
+        """
+        Publishes an issue state change to the event stream.
+        """
+        if attribute == "assigned_agent":
+            self.event_stream.publish(EventType.ISSUE_ASSIGNED, issue.issue_id, agent_id=new_value.agent_id, email=issue.email)
+        elif attribute == "status":
+            if new_value == IssueStatus.WAITING:
+                event_type = EventType.ISSUE_WAITLISTED
+            elif new_value == IssueStatus.RESOLVED:
+                event_type = EventType.ISSUE_RESOLVED
+            else:
+                event_type = EventType.ISSUE_STATUS_UPDATED
+            self.event_stream.publish(event_type, issue.issue_id, old_status=old_value.value, status=new_value.value,
+                                      resolution=issue.resolution, email=issue.email)
 
     def resolve_issue(self, issue_id, resolution):
         """
         Resolves an issue by its ID with the provided resolution.
 
+        The issue, its follow-ups, the assigned agent, the status buckets and the waitlist are updated
+        in one step, and the freed agent is immediately handed the longest-waiting issue it can work on.
+
         :param issue_id: The ID of the issue to be resolved
         :param resolution: Description of how the issue was resolved
+        :return: The waiting Issue assigned to the freed agent, if any
         """
-        self.update_issue(issue_id, IssueStatus.RESOLVED, resolution)
+        next_issue = None
+        with self.lock:
+            issue = self.get_issue_by_id(issue_id)
+            if issue is None:
+                return None
+            agent = issue.assigned_agent
+            if agent is not None and agent.current_issue is issue:
+                agent.resolve_current_issue(resolution)
+                next_issue = self.get_next_waiting_issue(agent.expertise)
+                if next_issue is not None:
+                    agent.assign_issue(next_issue)
+            else:
+                issue.update_status(IssueStatus.RESOLVED, resolution)
         logging.info(f"Issue {issue_id} resolved with resolution: {resolution}")
+        return next_issue
@@ -7,7 +7,6 @@ Simulates the workflow of the Customer Issue Resolution System using multithread
 import sys
 import threading
 import time
-import json
 import logging
 from issue import IssueStatus
 from issue_manager import IssueManager
@@ -15,6 +14,8 @@ from agent_manager import AgentManager
 from agent_assignment_strategy import AgentAssignmentStrategy
 from issue_type import IssueType
 from factory import IssueFactory, AgentFactory, UserFactory
+from snapshot import take_read_view
+from roster_loader import DEFAULT_ROSTER_PATH, load_roster
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,28 +23,17 @@ logging.basicConfig(level=logging.INFO)
 # Global lock for synchronizing access to shared resources
 lock = threading.Lock()
 
-def load_initial_data(agent_manager, user_factory):
+def load_initial_data(agent_manager, user_factory, path=DEFAULT_ROSTER_PATH, snapshot_path=None):
     """
     Loads initial agents and users from a JSON file.
 
     :param agent_manager: The AgentManager instance
     :param user_factory: The UserFactory instance
+    :param path: Path to the JSON roster; defaults to initial_data.json next to this module
+    :param snapshot_path: Optional path of a binary roster snapshot for fast warm starts
     :return: A list of User objects
     """
-    with open('src/initial_data.json', 'r') as file:
-        data = json.load(file)
-
-    for agent_data in data['agents']:
-        agent_manager.add_agent(agent_data['email'], agent_data['name'], agent_data['expertise'])
-        logging.info(f"Agent {agent_data['name']} added.")
-
-    users = []
-    for user_data in data['users']:
-        user = user_factory.create_user(user_data['email'], user_data['name'])
-        users.append(user)
-        logging.info(f"User {user_data['name']} created.")
-
-    return users
+    return load_roster(agent_manager, user_factory, path, snapshot_path)
 
 def create_issues(user, issue_manager):
     """
@@ -87,10 +77,11 @@ def resolve_issues(agent, issue_manager):
     with lock:
         if agent.current_issue:
             issue_id = agent.current_issue.issue_id  # Capture the issue ID before changing the state
-            issue_manager.update_issue(issue_id, IssueStatus.RESOLVED)
-            agent.resolve_current_issue("Issue resolved by refunding the amount")
-            issue_manager.resolve_issue(issue_id, "Issue resolved by refunding the amount")
+            # Resolves the issue, frees the agent and hands it the next waiting issue in one step
+            next_issue = issue_manager.resolve_issue(issue_id, "Issue resolved by refunding the amount")
             logging.info(f"Issue {issue_id} resolved by agent {agent.name}.")
+            if next_issue:
+                logging.info(f"Agent {agent.name} picked up waiting issue {next_issue.issue_id}.")
             time.sleep(5)  # Simulating delay in resolving the issue
         else:
             logging.warning(f"Agent {agent.name} has no current issue to resolve.")
@@ -139,13 +130,16 @@ def main():
     for thread in resolve_threads:
         thread.join()
 
+    # Report from a consistent snapshot so that reporting does not block intake or assignment
+    read_view = take_read_view(issue_manager, agent_manager)
+
     # Print agent work history
-    for agent in agent_manager.agents.values():
-        print(f"Agent {agent.name} worked on: {[issue.issue_id for issue in agent.work_history]}")
+    for name, issue_ids in read_view.agents.view_agents_work_history().items():
+        print(f"Agent {name} worked on: {issue_ids}")
 
     # Print issues by status
     for status in [IssueStatus.OPEN, IssueStatus.IN_PROGRESS, IssueStatus.RESOLVED, IssueStatus.WAITING]:
-        print(f"Issues with status {status.value}: {[issue.issue_id for issue in issue_manager.get_issues_by_status(status)]}")
+        print(f"Issues with status {status.value}: {[record.issue_id for record in read_view.issues.get_issues_by_status(status)]}")
 
     # Exit the program gracefully
     sys.exit(0)
@@ -0,0 +1,145 @@
+"""
+partitioned_store.py
+
+Groups issues into fixed-width time partitions by creation time, so that time-range queries only visit
+the partitions overlapping the range and expired issues are dropped a whole partition at a time.
+"""
+
+import logging
+import threading
+from bisect import bisect_left, bisect_right, insort
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
+class TimePartitionedStore:
+    """
+    Issues partitioned by creation time into buckets of partition_seconds (hourly by default).
+    """
+    def __init__(self, partition_seconds=60 * 60):
+        """
+        Initializes the store.
+
+        :param partition_seconds: Width of each partition in seconds
+        """
+        self.partition_seconds = partition_seconds
+        self.partitions = {}  # partition start time -> {issue_id: Issue}, in creation order
+        self.starts = []  # Sorted start times of the non-empty partitions
+
+    def __len__(self):
+        return sum(len(partition) for partition in self.partitions.values())
+
+    def partition_start(self, timestamp):
+        """
+        :param timestamp: Seconds since the epoch
+        :return: Start time of the partition containing the timestamp
+        """
+        return timestamp // self.partition_seconds * self.partition_seconds
+
+    def add(self, issue):
+        """
+        Adds an issue to the partition covering its creation time.
+
+        :param issue: The Issue object
+        """
+        start = self.partition_start(issue.created_at)
+        partition = self.partitions.get(start)
+        if partition is None:
+            partition = self.partitions[start] = {}
+            insort(self.starts, start)
+        partition[issue.issue_id] = issue
+
+    def remove(self, issue):
+        """
+        Removes a single issue; expired issues are removed in bulk with drop_expired instead.
+
+        :param issue: The Issue object
+        """
+        start = self.partition_start(issue.created_at)
+        partition = self.partitions.get(start)
+        if partition is None or partition.pop(issue.issue_id, None) is None:
+            return
+        if not partition:
+            del self.partitions[start]
+            del self.starts[bisect_left(self.starts, start)]
+
+    def get_range(self, start=None, end=None):
+        """
+        Returns the issues created in [start, end), visiting only the partitions that overlap the range.
+
+        :param start: Inclusive lower bound in seconds since the epoch, or None for no bound
+        :param end: Exclusive upper bound in seconds since the epoch, or None for no bound
+        :return: A list of Issue objects ordered by partition, then creation order
+        """
+        first = 0 if start is None else bisect_left(self.starts, self.partition_start(start))
+        last = len(self.starts) if end is None else bisect_left(self.starts, end)
+        issues = []
+        for partition_start in self.starts[first:last]:
+            partition = self.partitions[partition_start]
+            # Only the partitions at the edges of the range can hold issues outside it
+            if (start is None or partition_start >= start) and (end is None or partition_start + self.partition_seconds <= end):
+                issues.extend(partition.values())
+            else:
+                issues.extend(issue for issue in partition.values()
+                              if (start is None or issue.created_at >= start) and (end is None or issue.created_at < end))
+        return issues
+
+    def drop_expired(self, cutoff, keep=None):
+        """
+        Removes the partitions that ended at or before the cutoff.
+
+        :param cutoff: Seconds since the epoch; partitions ending at or before it are expired
+        :param keep: Optional predicate; issues for which it returns True stay in their partition
+        :return: A list of (partition start, list of removed issues) tuples
+        """
+        count = bisect_right(self.starts, cutoff - self.partition_seconds)
+        dropped = []
+        retained_starts = []
+        for start in self.starts[:count]:
+            partition = self.partitions.pop(start)
+            if keep is None:
+                removed = list(partition.values())
+            else:
+                retained = {issue_id: issue for issue_id, issue in partition.items() if keep(issue)}
+                removed = [issue for issue_id, issue in partition.items() if issue_id not in retained]
+                if retained:
+                    self.partitions[start] = retained
+                    retained_starts.append(start)
+            if removed:
+                dropped.append((start, removed))
+        self.starts[:count] = retained_starts
+        return dropped
+
+class PartitionCompactor(threading.Thread):
+    """
+    Background thread that periodically drops or archives the expired partitions of an IssueManager.
+    """
+    def __init__(self, issue_manager, retention_seconds, interval_seconds=60, archive=None):
+        """
+        Initializes the compactor. Call start() to run it and stop() to shut it down.
+
+        :param issue_manager: The IssueManager instance
+        :param retention_seconds: How long resolved issues are kept after their partition ends
+        :param interval_seconds: Seconds between compaction passes
+        :param archive: Optional callable invoked as archive(partition_start, issues) for every dropped partition
+        """
+        super().__init__(name="partition-compactor", daemon=True)
+        self.issue_manager = issue_manager
+        self.retention_seconds = retention_seconds
+        self.interval_seconds = interval_seconds
+        self.archive = archive
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval_seconds):
+            try:
+                self.issue_manager.compact_partitions(self.retention_seconds, archive=self.archive)
+            except Exception:
+                logging.exception("Partition compaction failed")
+
+    def stop(self):
+        """
+        Stops the compactor and waits for the current pass to finish.
+        """
+        self.stop_event.set()
+        self.join()
@@ -0,0 +1,160 @@
+"""
+query_cache.py
+
+Implements a size-bounded LRU cache for issue filter results with attribute-driven invalidation.
+"""
+
+import threading
+from collections import OrderedDict, defaultdict
+
+class QueryCache:
+    """
+    LRU cache of filter results keyed by the normalized filter criteria.
+
+    Each entry remembers the attributes its filter depends on, so a change to one attribute of an issue
+    only evicts the entries filtering on that attribute with the old or new value whose other criteria
+    match the issue.
+    """
+    def __init__(self, max_entries=256):
+        """
+        Initializes the cache.
+
+        :param max_entries: Maximum number of cached results before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (criteria, tuple of issues)
+        self.keys_by_attribute = defaultdict(set)  # attribute -> keys of entries filtering on it
+        self.generation = 0  # Bumped on every invalidation, used to discard results computed concurrently
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(namespace, criteria):
+        """
+        Normalizes filter criteria into a cache key.
+
+        :param namespace: Distinguishes queries with different result orderings
+        :param criteria: Dictionary of attribute -> value
+        :return: A hashable key, or None if the criteria cannot be cached
+        """
+        try:
+            key = (namespace, frozenset(criteria.items()))
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key):
+        """
+        Looks up a cached result.
+
+        :param key: A key from make_key
+        :return: A new list of the cached issues, or None on a miss
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, key, criteria, issues, generation):
+        """
+        Stores a result unless the cache was invalidated while it was being computed.
+
+        :param key: A key from make_key
+        :param criteria: The filter criteria the result was computed for
+        :param issues: The matching issues
+        :param generation: Value of self.generation read before computing the result
+        """
+        with self.lock:
+            if generation != self.generation:
+                return
+            self.entries[key] = (dict(criteria), tuple(issues))
+            self.entries.move_to_end(key)
+            for attribute in criteria:
+                self.keys_by_attribute[attribute].add(key)
+            while len(self.entries) > self.max_entries:
+                oldest_key, _ = self.entries.popitem(last=False)
+                self._unlink(oldest_key)
+                self.evictions += 1
+
+    def invalidate_attribute(self, issue, attribute, old_value, new_value):
+        """
+        Evicts the entries whose filter on an attribute matches its old or new value and whose other
+        criteria match the changed issue, i.e. the entries whose result gains or loses the issue.
+
+        :param issue: The changed Issue object; only the given attribute may have changed since the last call
+        :param attribute: Name of the changed issue attribute
+        :param old_value: Value before the change
+        :param new_value: Value after the change
+        """
+        with self.lock:
+            self.generation += 1
+            stale = []
+            for key in self.keys_by_attribute.get(attribute, ()):
+                criteria = self.entries[key][0]
+                if criteria[attribute] in (old_value, new_value) and all(
+                        getattr(issue, other, None) == value for other, value in criteria.items() if other != attribute):
+                    stale.append(key)
+            for key in stale:
+                self._evict(key)
+
+    def invalidate_matching(self, issue):
+        """
+        Evicts the entries whose filter matches an issue, used when issues are added or removed.
+
+        :param issue: The Issue object that was added or removed
+        """
+        with self.lock:
+            self.generation += 1
+            stale = [
+                key for key, (criteria, _) in self.entries.items()
+                if all(getattr(issue, attribute, None) == value for attribute, value in criteria.items())
+            ]
+            for key in stale:
+                self._evict(key)
+
+    def invalidate_all(self):
+        """
+        Evicts every entry, used when many issues are removed at once.
+        """
+        with self.lock:
+            self.generation += 1
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+            self.keys_by_attribute.clear()
+
+    def stats(self):
+        """
+        Returns cache statistics.
+
+        :return: A dictionary with hits, misses, hit_rate, size, evictions and invalidations
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self.entries),
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _evict(self, key):
+        del self.entries[key]
+        self._unlink(key)
+        self.invalidations += 1
+
+    def _unlink(self, key):
+        for attribute, _ in key[1]:
+            keys = self.keys_by_attribute[attribute]
+            keys.discard(key)
+            if not keys:
+                del self.keys_by_attribute[attribute]
@@ -0,0 +1,248 @@
+"""
+roster_loader.py
+
+Loads the agent and user roster quickly: the JSON roster is parsed incrementally and bulk-loaded into
+the managers, and an optional precompiled binary snapshot of the roster makes warm starts near-instant.
+"""
+
+import gc
+import json
+import logging
+import marshal
+import os
+import uuid
+
+from factory import UserFactory
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
+DEFAULT_ROSTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "initial_data.json")
+
+SNAPSHOT_MAGIC = "issue-roster"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SEPARATOR = "\x00"
+
+class RosterFormatError(Exception):
+    """
+    Raised when a roster file is not a JSON object of arrays.
+    """
+
+class _ChunkedJSONReader:
+    """
+    Decodes JSON values one at a time from a file read in fixed-size chunks.
+    """
+    WHITESPACE = " \t\n\r"
+
+    def __init__(self, file, chunk_size):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        # Drop the consumed prefix so that memory stays proportional to the chunk size
+        if self.position:
+            self.buffer = self.buffer[self.position:]
+            self.position = 0
+        chunk = self.file.read(self.chunk_size)
+        if chunk:
+            self.buffer += chunk
+        else:
+            self.eof = True
+
+    def peek(self):
+        """
+        Skips whitespace and returns the next character, or "" at the end of the file.
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in self.WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer) or self.eof:
+                return self.buffer[self.position:self.position + 1]
+            self._fill()
+
+    def expect(self, characters):
+        """
+        Consumes the next character, which must be one of the given characters.
+        """
+        character = self.peek()
+        if not character or character not in characters:
+            raise RosterFormatError(f"Expected one of {characters!r} but found {character!r}")
+        self.position += 1
+        return character
+
+    def decode(self):
+        """
+        Decodes the next complete JSON value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # A value ending exactly at the buffer end may be a truncated number
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise RosterFormatError(f"Invalid roster JSON: {e}") from None
+            self._fill()
+
+def iter_roster(path=DEFAULT_ROSTER_PATH, chunk_size=1 << 16):
+    """
+    Streams the entries of a roster file such as {"agents": [...], "users": [...]}.
+
+    Entries are parsed one at a time, so memory use does not depend on the size of the roster.
+
+    :param path: Path to the JSON roster
+    :param chunk_size: Number of characters read from the file at a time
+    :return: An iterator of (section, entry) tuples, e.g. ("agents", {"email": ..., "name": ..., "expertise": [...]})
+    """
+    with open(path, "r") as file:
+        reader = _ChunkedJSONReader(file, chunk_size)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            section = reader.decode()
+            reader.expect(":")
+            if reader.peek() == "[":
+                reader.expect("[")
+                if reader.peek() != "]":
+                    while True:
+                        yield section, reader.decode()
+                        if reader.expect(",]") == "]":
+                            break
+                else:
+                    reader.expect("]")
+            else:
+                reader.decode()  # Sections other than arrays are not part of the roster
+            if reader.expect(",}") == "}":
+                return
+
+def read_roster(path=DEFAULT_ROSTER_PATH):
+    """
+    Reads a JSON roster into compact row tuples.
+
+    :param path: Path to the JSON roster
+    :return: A tuple of (agent rows as (email, name, expertise tuple), user rows as (email, name))
+    """
+    agent_rows = []
+    user_rows = []
+    for section, entry in iter_roster(path):
+        if section == "agents":
+            agent_rows.append((entry["email"], entry["name"], tuple(entry["expertise"])))
+        elif section == "users":
+            user_rows.append((entry["email"], entry["name"]))
+    return agent_rows, user_rows
+
+def _source_signature(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+def new_agent_ids(count):
+    """
+    Generates random version 4 UUID strings in bulk, drawing the random bytes with a single os.urandom call.
+
+    :param count: Number of IDs to generate
+    :return: A list of UUID strings
+    """
+    random_bytes = os.urandom(16 * count)
+    return [str(uuid.UUID(bytes=random_bytes[start:start + 16], version=4)) for start in range(0, 16 * count, 16)]
+
+def write_roster_snapshot(agent_ids, agent_rows, user_rows, snapshot_path, source_path):
+    """
+    Writes a binary snapshot of the roster, tagged with the size and modification time of its source.
+
+    The roster is stored column by column, with each text column joined into a single string and expertise
+    stored as indexes into a table of distinct expertise lists, so that loading it creates few objects.
+
+    :param agent_ids: Agent IDs, parallel to agent_rows, so that IDs are stable across warm starts
+    :param agent_rows: Agent rows as returned by read_roster
+    :param user_rows: User rows as returned by read_roster
+    :param snapshot_path: Path of the snapshot file to write
+    :param source_path: Path of the JSON roster the rows were read from
+    :return: True if the snapshot was written
+    """
+    expertise_table = {}
+    agent_expertise = [expertise_table.setdefault(expertise, len(expertise_table)) for _, _, expertise in agent_rows]
+    columns = {
+        "agent_ids": agent_ids,
+        "agent_emails": [email for email, _, _ in agent_rows],
+        "agent_names": [name for _, name, _ in agent_rows],
+        "user_emails": [email for email, _ in user_rows],
+        "user_names": [name for _, name in user_rows],
+    }
+    if any(SNAPSHOT_SEPARATOR in value for column in columns.values() for value in column):
+        logging.warning(f"Roster {source_path} contains control characters; snapshot not written")
+        return False
+
+    payload = (
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, _source_signature(source_path),
+        {name: (len(column), SNAPSHOT_SEPARATOR.join(column)) for name, column in columns.items()},
+        tuple(expertise_table), agent_expertise,
+    )
+    temporary_path = f"{snapshot_path}.tmp"
+    with open(temporary_path, "wb") as file:
+        marshal.dump(payload, file)
+    os.replace(temporary_path, snapshot_path)
+    logging.info(f"Roster snapshot written to {snapshot_path}")
+    return True
+
+def read_roster_snapshot(snapshot_path, source_path):
+    """
+    Reads a binary roster snapshot if it exists and is up to date with its source.
+
+    :param snapshot_path: Path of the snapshot file
+    :param source_path: Path of the JSON roster the snapshot was built from
+    :return: A tuple of (agent IDs, agent rows, user rows), or None if the snapshot is missing, stale or unreadable
+    """
+    try:
+        with open(snapshot_path, "rb") as file:
+            magic, version, signature, columns, expertise_table, agent_expertise = marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or signature != _source_signature(source_path):
+        logging.info(f"Roster snapshot {snapshot_path} is stale; reloading {source_path}")
+        return None
+
+    def column(name):
+        count, joined = columns[name]
+        return joined.split(SNAPSHOT_SEPARATOR) if count else []
+
+    agent_rows = list(zip(column("agent_emails"), column("agent_names"), [expertise_table[i] for i in agent_expertise]))
+    user_rows = list(zip(column("user_emails"), column("user_names")))
+    return column("agent_ids"), agent_rows, user_rows
+
+def load_roster(agent_manager, user_factory=UserFactory, path=DEFAULT_ROSTER_PATH, snapshot_path=None):
+    """
+    Loads the roster into the AgentManager and creates its users.
+
+    :param agent_manager: The AgentManager instance
+    :param user_factory: The UserFactory used to create users in bulk
+    :param path: Path to the JSON roster
+    :param snapshot_path: Optional path of a binary snapshot used for warm starts; written if missing or stale
+    :return: A list of User objects
+    """
+    roster = read_roster_snapshot(snapshot_path, path) if snapshot_path else None
+    if roster is None:
+        agent_rows, user_rows = read_roster(path)
+        roster = (new_agent_ids(len(agent_rows)), agent_rows, user_rows)
+        if snapshot_path:
+            write_roster_snapshot(*roster, snapshot_path, path)
+    agent_ids, agent_rows, user_rows = roster
+
+    # Bulk-creating objects that all stay alive triggers repeated, fruitless garbage collection passes
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        agent_manager.add_agents(agent_rows, agent_ids)
+        users = user_factory.create_users(user_rows)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    logging.info(f"Loaded roster with {len(agent_rows)} agents and {len(users)} users")
+    return users
@@ -0,0 +1,194 @@
+"""
+search_index.py
+
+Implements an incrementally maintained inverted index for full-text search over issue subjects and descriptions.
+"""
+
+import math
+import re
+from bisect import bisect_left, insort
+from collections import defaultdict
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
+TOKEN_PATTERN = re.compile(r"\w+")
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+def tokenize(text):
+    """
+    Splits text into lowercase word tokens.
+
+    :param text: The text to tokenize
+    :return: A list of tokens
+    """
+    return [token.lower() for token in TOKEN_PATTERN.findall(text or "")]
+
+class SearchIndex:
+    """
+    Inverted index mapping terms to the positions at which they occur in each document.
+
+    A document is the subject followed by the description; the description positions are offset
+    so that phrases never span both fields. Matches in the subject are weighted higher when ranking.
+    """
+    SUBJECT_WEIGHT = 2.0
+
+    def __init__(self):
+        self.postings = defaultdict(dict)  # term -> {doc_id: [positions]}
+        self.sorted_terms = []  # Vocabulary in sorted order, used for prefix queries
+        self.doc_terms = {}  # doc_id -> set of terms, used for removal
+        self.subject_lengths = {}  # doc_id -> number of subject tokens
+        self.doc_order = {}  # doc_id -> insertion sequence, used as a stable tie-breaker
+        self._next_seq = 0
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def add(self, doc_id, subject, description):
+        """
+        Indexes a document.
+
+        :param doc_id: Unique ID of the document
+        :param subject: Subject text
+        :param description: Description text
+        """
+        if doc_id in self.doc_terms:
+            self.remove(doc_id)
+
+        subject_tokens = tokenize(subject)
+        # Leave a gap of one position so that phrases do not match across fields
+        offset = len(subject_tokens) + 1
+        positioned = list(enumerate(subject_tokens)) + [(offset + i, token) for i, token in enumerate(tokenize(description))]
+
+        for position, token in positioned:
+            doc_postings = self.postings.get(token)
+            if doc_postings is None:
+                doc_postings = self.postings[token]
+                insort(self.sorted_terms, token)
+            doc_postings.setdefault(doc_id, []).append(position)
+
+        self.doc_terms[doc_id] = {token for _, token in positioned}
+        self.subject_lengths[doc_id] = len(subject_tokens)
+        self.doc_order[doc_id] = self._next_seq
+        self._next_seq += 1
+
+    def remove(self, doc_id):
+        """
+        Removes a document from the index.
+
+        :param doc_id: Unique ID of the document
+        """
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            doc_postings = self.postings[term]
+            doc_postings.pop(doc_id, None)
+            if not doc_postings:
+                del self.postings[term]
+                self.sorted_terms.pop(bisect_left(self.sorted_terms, term))
+        del self.subject_lengths[doc_id]
+        del self.doc_order[doc_id]
+
+    def search(self, query, candidates=None):
+        """
+        Finds the documents matching every clause of a query, ranked by relevance.
+
+        Supported clauses are plain terms (refund), prefixes (refu*) and quoted phrases ("money debited").
+
+        :param query: The query string
+        :param candidates: Optional predicate on doc_id restricting the results
+        :return: A list of (doc_id, score) tuples, best match first
+        """
+        clauses = self._parse(query)
+        if not clauses:
+            return []
+
+        # Evaluate the most selective clauses first so that the intersection shrinks quickly
+        matched = []
+        for kind, terms in clauses:
+            matched.append((kind, terms, self._match_clause(kind, terms)))
+        matched.sort(key=lambda clause: len(clause[2]))
+
+        doc_ids = set(matched[0][2])
+        for _, _, clause_docs in matched[1:]:
+            doc_ids.intersection_update(clause_docs)
+            if not doc_ids:
+                return []
+        if candidates is not None:
+            doc_ids = {doc_id for doc_id in doc_ids if candidates(doc_id)}
+
+        results = [(doc_id, self._score(doc_id, matched)) for doc_id in doc_ids]
+        results.sort(key=lambda result: (-result[1], self.doc_order[result[0]]))
+        return results
+
+    def _parse(self, query):
+        """
+        Splits a query into (kind, terms) clauses.
+        """
+        clauses = []
+        for phrase, word in QUERY_PATTERN.findall(query or ""):
+            if phrase:
+                tokens = tokenize(phrase)
+                if len(tokens) == 1:
+                    clauses.append(("term", tokens))
+                elif tokens:
+                    clauses.append(("phrase", tokens))
+            else:
+                tokens = tokenize(word)
+                if word.endswith("*") and tokens:
+                    # Only the last token of a word such as "re-fu*" is a prefix
+                    clauses.extend(("term", [token]) for token in tokens[:-1])
+                    clauses.append(("prefix", tokens[-1:]))
+                else:
+                    clauses.extend(("term", [token]) for token in tokens)
+        return clauses
+
+    def _match_clause(self, kind, terms):
+        """
+        Returns a mapping of doc_id to the matched terms for a single clause.
+        """
+        if kind == "term":
+            return dict.fromkeys(self.postings.get(terms[0], ()), terms)
+
+        if kind == "prefix":
+            prefix = terms[0]
+            matches = defaultdict(list)
+            start = bisect_left(self.sorted_terms, prefix)
+            for term in self.sorted_terms[start:]:
+                if not term.startswith(prefix):
+                    break
+                for doc_id in self.postings[term]:
+                    matches[doc_id].append(term)
+            return matches
+
+        # Phrase: intersect the postings, then check that positions line up
+        postings = [self.postings.get(term) for term in terms]
+        if not all(postings):
+            return {}
+        shortest = min(postings, key=len)
+        matches = {}
+        for doc_id in shortest:
+            if all(doc_id in doc_postings for doc_postings in postings):
+                following = [set(doc_postings[doc_id]) for doc_postings in postings[1:]]
+                for start in postings[0][doc_id]:
+                    if all(start + i + 1 in positions for i, positions in enumerate(following)):
+                        matches[doc_id] = terms
+                        break
+        return matches
+
+    def _score(self, doc_id, matched):
+        """
+        Computes a TF-IDF score for a document, weighting subject matches higher.
+        """
+        total_docs = len(self.doc_terms)
+        subject_length = self.subject_lengths[doc_id]
+        score = 0.0
+        for _, _, clause_docs in matched:
+            for term in clause_docs[doc_id]:
+                doc_postings = self.postings[term]
+                idf = math.log(1 + total_docs / len(doc_postings))
+                weight = sum(self.SUBJECT_WEIGHT if position < subject_length else 1.0 for position in doc_postings[doc_id])
+                score += weight * idf
+        return score
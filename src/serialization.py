@@ -0,0 +1,64 @@
+"""
+serialization.py
+
+Converts issues and agents to JSON-ready dictionaries and encodes them compactly.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library encoder is used without it
+    orjson = None
+
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, check_circular=False)
+
+def dumps(value):
+    """
+    Encodes a value as compact UTF-8 JSON.
+
+    :param value: A JSON-serializable value
+    :return: The encoded bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return _encoder.encode(value).encode("utf-8")
+
+def issue_to_dict(issue):
+    """
+    Converts an Issue to a JSON-ready dictionary.
+
+    :param issue: The Issue object
+    :return: A dictionary of plain values
+    """
+    return {
+        "issue_id": issue.issue_id,
+        "transaction_id": issue.transaction_id,
+        "issue_type": issue.issue_type,
+        "subject": issue.subject,
+        "description": issue.description,
+        "email": issue.email,
+        "status": issue.status.value,
+        "resolution": issue.resolution,
+        "assigned_agent_id": issue.assigned_agent.agent_id if issue.assigned_agent else None,
+        "duplicate_of": issue.duplicate_of,
+        "created_at": issue.created_at,
+        "assigned_at": issue.assigned_at,
+        "resolved_at": issue.resolved_at,
+    }
+
+def agent_to_dict(agent):
+    """
+    Converts an Agent to a JSON-ready dictionary.
+
+    :param agent: The Agent object
+    :return: A dictionary of plain values
+    """
+    return {
+        "agent_id": agent.agent_id,
+        "name": agent.name,
+        "email": agent.email,
+        "expertise": list(agent.expertise),
+        "status": agent.status.value,
+        "current_issue_id": agent.current_issue.issue_id if agent.current_issue else None,
+    }
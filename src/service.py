@@ -0,0 +1,425 @@
+"""
+service.py
+
+Serves the Customer Issue Resolution System over HTTP/JSON on localhost.
+
+The server is a single asyncio event loop speaking HTTP/1.1 with keep-alive. Requests are not executed
+as they arrive: they are queued and a batcher hands every pending operation to a dedicated worker thread,
+which runs the batch under one acquisition of the IssueManager lock while the event loop keeps serving
+connections. Identical reads in a batch are executed once. Writes are applied one at a time in arrival order,
+because each depends on the state left by the ones before it (duplicate detection, agent availability,
+waitlist capacity), so for them the batch only shares the lock acquisition.
+
+Usage: python src/service.py [--host 127.0.0.1] [--port 8080] [--log-level WARNING]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from admission_control import AdmissionRejected, AdmissionResult
+from agent_assignment_strategy import AgentAssignmentStrategy
+from agent_manager import AgentManager
+from factory import UserFactory
+from issue import InvalidStatusTransition, IssueStatus
+from issue_manager import IssueManager
+from issue_type import IssueType
+from roster_loader import load_roster
+from serialization import agent_to_dict, dumps, issue_to_dict
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 409: "Conflict",
+           429: "Too Many Requests", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+class ServiceError(Exception):
+    """
+    Raised by request handlers to produce an HTTP error response.
+    """
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+class IssueService:
+    """
+    HTTP/JSON front-end for the IssueManager and AgentManager.
+
+    Routes:
+      POST  /issues                  create_issue (and assign it to an agent)
+      GET   /issues?status=Open&...  get_issues
+      PATCH /issues/<id>             update_issue
+      POST  /issues/<id>/resolve     resolve_issue
+      POST  /agents                  add_agent
+      GET   /agents/work-history     view_agents_work_history
+    """
+    ISSUE_FILTERS = ("status", "issue_type", "email", "transaction_id")
+    MAX_BATCH_SIZE = 256
+
+    def __init__(self, issue_manager, agent_manager, strategy, max_batch_size=MAX_BATCH_SIZE):
+        """
+        Initializes the service.
+
+        :param issue_manager: The IssueManager instance
+        :param agent_manager: The AgentManager instance
+        :param strategy: The AgentAssignmentStrategy used for new issues
+        :param max_batch_size: Maximum number of operations executed under one lock acquisition
+        """
+        self.issue_manager = issue_manager
+        self.agent_manager = agent_manager
+        self.strategy = strategy
+        self.max_batch_size = max_batch_size
+        self.server = None
+        self.queue = None
+        self.batcher = None
+        self.closing = False
+        self.idle_writers = set()  # Connections waiting for their next request
+        self.executor = None  # Single worker thread that executes batches off the event loop
+        self.batches = 0
+        self.operations = 0
+        self.coalesced_reads = 0
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """
+        Starts listening and batching.
+
+        :param host: Interface to bind
+        :param port: Port to bind; 0 picks a free port
+        :return: The bound port
+        """
+        self.queue = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="issue-batcher")
+        self.batcher = asyncio.create_task(self._run_batches())
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        port = self.server.sockets[0].getsockname()[1]
+        logging.warning(f"Issue service listening on http://{host}:{port}")
+        return port
+
+    async def close(self):
+        """
+        Stops the server and the batcher. The batch already running completes, operations queued behind it fail
+        with 503, and idle connections are closed.
+        """
+        if self.closing:
+            return
+        self.closing = True
+        self.server.close()
+        # A sentinel rather than cancellation, so a batch is never abandoned while the worker thread runs it
+        self.queue.put_nowait(None)
+        await self.batcher
+        while not self.queue.empty():
+            self._fail_operation(self.queue.get_nowait())
+        self.executor.shutdown()
+        for writer in list(self.idle_writers):
+            writer.close()
+        await self.server.wait_closed()
+
+    @staticmethod
+    def _fail_operation(item):
+        if item is None:
+            return
+        _, _, future = item
+        if not future.done():
+            future.set_exception(ServiceError(503, "Service is shutting down"))
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self.queue.get()
+            if item is None:
+                break
+            batch = [item]
+            # Let every handler that is ready to run enqueue its operation before executing the batch
+            await asyncio.sleep(0)
+            while len(batch) < self.max_batch_size and not self.queue.empty():
+                item = self.queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            batch = [item for item in batch if not item[2].cancelled()]
+            outcomes = await loop.run_in_executor(self.executor, self._execute_batch, batch)
+            for (_, _, future), (result, error) in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            self.batches += 1
+            self.operations += len(batch)
+
+    def _execute_batch(self, batch):
+        """
+        Runs a batch on the worker thread. Futures are only touched back on the event loop.
+
+        :param batch: A list of (operation, coalescing key, future) tuples
+        :return: A list of (result, exception) tuples, one per operation
+        """
+        outcomes = []
+        reads = {}  # Coalescing key -> outcome of the read already executed since the last write
+        with self.issue_manager.lock:
+            for operation, key, _ in batch:
+                if key is not None and key in reads:
+                    outcomes.append(reads[key])
+                    self.coalesced_reads += 1
+                    continue
+                try:
+                    outcome = (operation(), None)
+                except Exception as e:
+                    outcome = (None, e)
+                if key is None:
+                    # A write may change what any earlier read returned
+                    reads.clear()
+                else:
+                    reads[key] = outcome
+                outcomes.append(outcome)
+        return outcomes
+
+    async def _submit(self, operation, key=None):
+        """
+        Queues an operation for the next batch.
+
+        :param operation: Callable returning a (status, payload) tuple
+        :param key: Hashable key identifying a read-only operation; identical reads in a batch run once
+        :return: The operation's result
+        """
+        if self.closing:
+            raise ServiceError(503, "Service is shutting down")
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((operation, key, future))
+        return await future
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                self.idle_writers.add(writer)
+                try:
+                    request_line = await reader.readline()
+                finally:
+                    self.idle_writers.discard(writer)
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._write_response(writer, 400, {"error": "Malformed request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._write_response(writer, 400, {"error": "Invalid Content-Length"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                extra_headers = {}
+                try:
+                    status, payload = await self._dispatch(method, target, body)
+                except ServiceError as e:
+                    status, payload, extra_headers = e.status, {"error": str(e)}, e.headers
+                except Exception as e:
+                    logging.exception(f"Request {method} {target} failed")
+                    status, payload = 500, {"error": str(e)}
+                keep_alive = keep_alive and not self.closing
+                await self._write_response(writer, status, payload, keep_alive, extra_headers)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _write_response(self, writer, status, payload, keep_alive, extra_headers=None):
+        body = dumps(payload)
+        head = [
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        head.extend(f"{name}: {value}" for name, value in (extra_headers or {}).items())
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _dispatch(self, method, target, body):
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+
+        if parts == ["issues"]:
+            if method == "POST":
+                return await self._submit(self._create_issue_operation(self._parse_body(body)))
+            if method == "GET":
+                filter = self._parse_filter(url.query)
+                return await self._submit(self._get_issues_operation(filter), key=("issues", frozenset(filter.items())))
+        elif len(parts) == 2 and parts[0] == "issues":
+            if method == "PATCH":
+                return await self._submit(self._update_issue_operation(parts[1], self._parse_body(body)))
+        elif len(parts) == 3 and parts[0] == "issues" and parts[2] == "resolve":
+            if method == "POST":
+                return await self._submit(self._resolve_issue_operation(parts[1], self._parse_body(body)))
+        elif parts == ["agents"]:
+            if method == "POST":
+                return await self._submit(self._add_agent_operation(self._parse_body(body)))
+        elif parts == ["agents", "work-history"]:
+            if method == "GET":
+                return await self._submit(lambda: (200, self.agent_manager.view_agents_work_history()),
+                                          key=("agents", "work-history"))
+        else:
+            raise ServiceError(404, f"No route for {url.path}")
+        raise ServiceError(405, f"Method {method} not allowed for {url.path}")
+
+    @staticmethod
+    def _parse_body(body):
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise ServiceError(400, "Request body is not valid JSON") from None
+        if not isinstance(data, dict):
+            raise ServiceError(400, "Request body must be a JSON object")
+        return data
+
+    @staticmethod
+    def _require(data, *fields):
+        missing = [field for field in fields if field not in data]
+        if missing:
+            raise ServiceError(400, f"Missing fields: {', '.join(missing)}")
+        return [data[field] for field in fields]
+
+    @staticmethod
+    def _parse_status(value):
+        try:
+            return IssueStatus(value)
+        except ValueError:
+            raise ServiceError(400, f"Unknown status: {value}") from None
+
+    @staticmethod
+    def _parse_issue_type(value):
+        if value not in IssueType.all_types():
+            raise ServiceError(400, f"Unknown issue type: {value}")
+        return value
+
+    def _parse_filter(self, query):
+        filter = {}
+        for key, value in parse_qsl(query):
+            if key not in self.ISSUE_FILTERS:
+                raise ServiceError(400, f"Unsupported filter: {key}")
+            if key == "status":
+                value = self._parse_status(value)
+            filter[key] = value
+        return filter
+
+    def _create_issue_operation(self, data):
+        transaction_id, issue_type, subject, description, email = self._require(
+            data, "transaction_id", "issue_type", "subject", "description", "email")
+        self._parse_issue_type(issue_type)
+
+        def operation():
+            try:
+                issue = self.issue_manager.create_issue(transaction_id, issue_type, subject, description, email)
+                result = self.issue_manager.try_assign_issue(self.strategy, issue)
+            except AdmissionRejected as e:
+                raise self._too_many_requests(e) from None
+            payload = issue_to_dict(issue)
+            if result == AdmissionResult.AUTO_ACKNOWLEDGED:
+                payload["acknowledgement"] = self.issue_manager.admission_controller.AUTO_ACKNOWLEDGE_MESSAGE
+            return 201, payload
+        return operation
+
+    def _get_issues_operation(self, filter):
+        return lambda: (200, [issue_to_dict(issue) for issue in self.issue_manager.get_issues(filter)])
+
+    def _update_issue_operation(self, issue_id, data):
+        status = self._parse_status(self._require(data, "status")[0])
+        resolution = data.get("resolution")
+
+        def operation():
+            issue = self._get_issue(issue_id)
+            try:
+                self.issue_manager.update_issue(issue_id, status, resolution)
+            except InvalidStatusTransition as e:
+                raise ServiceError(409, str(e)) from None
+            except AdmissionRejected as e:
+                raise self._too_many_requests(e) from None
+            return 200, issue_to_dict(issue)
+        return operation
+
+    def _resolve_issue_operation(self, issue_id, data):
+        resolution = self._require(data, "resolution")[0]
+
+        def operation():
+            issue = self._get_issue(issue_id)
+            next_issue = self.issue_manager.resolve_issue(issue_id, resolution)
+            return 200, {"issue": issue_to_dict(issue), "next_issue": issue_to_dict(next_issue) if next_issue else None}
+        return operation
+
+    def _add_agent_operation(self, data):
+        email, name, expertise = self._require(data, "email", "name", "expertise")
+        if not isinstance(expertise, list):
+            raise ServiceError(400, "expertise must be a list of issue types")
+        expertise = [self._parse_issue_type(issue_type) for issue_type in expertise]
+
+        def operation():
+            agent = self.agent_manager.add_agent(email, name, expertise)
+            # The new agent can take a waiting issue straight away
+            next_issue = self.issue_manager.get_next_waiting_issue(agent.expertise)
+            if next_issue is not None:
+                self.issue_manager.assign_issue_to_agent(next_issue, agent)
+            return 201, agent_to_dict(agent)
+        return operation
+
+    @staticmethod
+    def _too_many_requests(rejection):
+        headers = {"Retry-After": max(1, round(rejection.retry_after))} if rejection.retry_after else {}
+        return ServiceError(429, str(rejection), headers)
+
+    def _get_issue(self, issue_id):
+        issue = self.issue_manager.get_issue_by_id(issue_id)
+        if issue is None:
+            raise ServiceError(404, f"Issue {issue_id} not found")
+        return issue
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Customer Issue Resolution System over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--log-level", default="WARNING", help="Per-request INFO logging is costly under load")
+    parser.add_argument("--roster-snapshot", default=None, help="Optional binary roster snapshot for fast warm starts")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(args.log_level)
+
+    issue_manager = IssueManager()
+    agent_manager = AgentManager()
+    strategy = AgentAssignmentStrategy(agent_manager, issue_manager)
+    load_roster(agent_manager, UserFactory, snapshot_path=args.roster_snapshot)
+    service = IssueService(issue_manager, agent_manager, strategy)
+
+    async def serve():
+        await service.start(args.host, args.port)
+        await service.server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+snapshot.py
+
+Provides immutable point-in-time read views of issues and agents for reporting.
+
+The managers keep the immutable records of their issues and agents in a VersionedRecords store. A change
+adds a new version of the object's record instead of overwriting it, so taking a snapshot only captures a
+version number: it costs the same however many records there are, and reporting can query a snapshot for
+as long as it needs without holding the locks used by intake and assignment.
+"""
+
+import weakref
+from collections import namedtuple
+
+IssueRecord = namedtuple("IssueRecord", [
+    "issue_id", "transaction_id", "issue_type", "subject", "description", "email",
+    "status", "resolution", "assigned_agent_id", "duplicate_of", "sequence",
+    "created_at", "assigned_at", "resolved_at",
+])
+
+class AgentRecord(namedtuple("AgentRecord", [
+    "agent_id", "name", "email", "expertise", "status", "current_issue_id", "work_history_source", "work_history_length",
+])):
+    """
+    Immutable record of an agent. The work history is not copied: the record keeps the agent's append-only
+    work history list and its length at the time of the change, and slices it when it is read.
+    """
+    __slots__ = ()
+
+    @property
+    def work_history(self):
+        """
+        :return: A tuple of the IDs of the issues the agent had worked on when the record was taken
+        """
+        return tuple(issue.issue_id for issue in self.work_history_source[:self.work_history_length])
+
+ReadView = namedtuple("ReadView", ["issues", "agents"])
+
+def issue_record(issue):
+    """
+    Builds an immutable record of an issue's current state.
+
+    :param issue: The Issue object
+    :return: An IssueRecord
+    """
+    return IssueRecord(
+        issue.issue_id, issue.transaction_id, issue.issue_type, issue.subject, issue.description, issue.email,
+        issue.status, issue.resolution, issue.assigned_agent.agent_id if issue.assigned_agent else None,
+        issue.duplicate_of, issue.sequence, issue.created_at, issue.assigned_at, issue.resolved_at,
+    )
+
+def agent_record(agent):
+    """
+    Builds an immutable record of an agent's current state in constant time.
+
+    :param agent: The Agent object
+    :return: An AgentRecord
+    """
+    return AgentRecord(
+        agent.agent_id, agent.name, agent.email, tuple(agent.expertise), agent.status,
+        agent.current_issue.issue_id if agent.current_issue else None,
+        agent.work_history, len(agent.work_history),
+    )
+
+class _RecordHistory:
+    """
+    The versions of one key's record, oldest first, as a tuple of (version, record or None once removed).
+    The tuple is replaced rather than modified, so readers never see it change.
+    """
+    __slots__ = ("key", "order", "versions")
+
+    def __init__(self, key, order, versions):
+        self.key = key
+        self.order = order
+        self.versions = versions
+
+    def visible(self, version):
+        """
+        :param version: A snapshot version
+        :return: The record as of that version, or None if the key did not exist then
+        """
+        for record_version, record in reversed(self.versions):
+            if record_version <= version:
+                return record
+        return None
+
+class VersionedRecords:
+    """
+    Multi-version map of keys to immutable records.
+
+    Writers must hold the owning manager's lock. Versions that no live snapshot can see are pruned whenever
+    a key changes, so each key keeps one version plus those still needed by open snapshots. Removing a key
+    adds a tombstone version and leaves it in the log; the log is compacted once removed keys make up half
+    of it, so removal costs constant amortized time however many keys are stored.
+    """
+    MIN_COMPACTION = 64  # Removed keys tolerated in the log before it is compacted, however short it is
+
+    def __init__(self):
+        self.version = 0  # Number of changes applied
+        self.histories = {}  # key -> _RecordHistory, including removed keys until the log is compacted
+        self.log = []  # _RecordHistory objects in insertion order; replaced, never shrunk in place, on compaction
+        self.next_order = 0
+        self.live = 0  # Number of keys that have not been removed
+        self.dead = 0  # Number of removed keys still in the log
+        self.pinned = 0  # Removed keys kept by the last compaction because live snapshots could still see them
+        self.snapshots = weakref.WeakSet()  # Live snapshots, whose versions must stay readable
+
+    def __len__(self):
+        return self.live
+
+    def put(self, key, record):
+        """
+        Adds or replaces the record of a key.
+
+        :param key: The issue or agent ID
+        :param record: The new immutable record
+        """
+        self.version += 1
+        history = self.histories.get(key)
+        if history is None:
+            history = self.histories[key] = _RecordHistory(key, self.next_order, ((self.version, record),))
+            self.next_order += 1
+            self.log.append(history)
+            self.live += 1
+            return
+        if history.versions[-1][1] is None:
+            self.dead -= 1
+            self.live += 1
+        history.versions = self._prune(history.versions) + ((self.version, record),)
+
+    def remove(self, keys):
+        """
+        Removes keys in bulk as one change. Snapshots taken earlier still see their records.
+
+        :param keys: Iterable of keys to remove
+        """
+        self.version += 1
+        for key in keys:
+            history = self.histories.get(key)
+            if history is None or history.versions[-1][1] is None:
+                continue
+            history.versions = self._prune(history.versions) + ((self.version, None),)
+            self.live -= 1
+            self.dead += 1
+        if self.dead - self.pinned >= max(self.MIN_COMPACTION, len(self.log) // 2):
+            self._compact()
+
+    def _compact(self):
+        """
+        Drops the removed keys that no live snapshot can see from the log and the history map.
+        """
+        oldest = min((snapshot.version for snapshot in self.snapshots), default=self.version)
+        log = []
+        for history in self.log:
+            removed_at, record = history.versions[-1]
+            if record is None and removed_at <= oldest:
+                del self.histories[history.key]
+            else:
+                log.append(history)
+        # Snapshots keep iterating the previous list
+        self.log = log
+        self.dead = self.pinned = len(log) - self.live
+
+    def _prune(self, versions):
+        if not self.snapshots:
+            return ()
+        oldest = min(snapshot.version for snapshot in self.snapshots)
+        for index in range(len(versions) - 1, -1, -1):
+            if versions[index][0] <= oldest:
+                return versions[index:]
+        return versions
+
+class _Snapshot:
+    """
+    Point-in-time view of a VersionedRecords store. Must be created while holding the owner's lock.
+    """
+    def __init__(self, store):
+        """
+        :param store: The VersionedRecords store of the manager
+        """
+        self.version = store.version
+        self._histories = store.histories
+        self._log = store.log
+        self._count = len(store.log)
+        store.snapshots.add(self)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __iter__(self):
+        # Keys created later, and keys removed by then, have no visible record
+        for index in range(self._count):
+            record = self._log[index].visible(self.version)
+            if record is not None:
+                yield record
+
+    def _get(self, key):
+        # Compaction only drops keys removed before every live snapshot, which this snapshot would not see anyway
+        history = self._histories.get(key)
+        return history.visible(self.version) if history is not None else None
+
+class IssueSnapshot(_Snapshot):
+    """
+    Point-in-time view of all issues, iterated in creation order.
+    """
+    def get_issue_by_id(self, issue_id):
+        """
+        :param issue_id: The unique ID of the issue
+        :return: The IssueRecord, if found
+        """
+        return self._get(issue_id)
+
+    def get_issues(self, filter):
+        """
+        Retrieves the issue records matching a filter.
+
+        :param filter: A dictionary of IssueRecord field -> value (e.g., status, email)
+        :return: A list of IssueRecords in creation order
+        """
+        return [record for record in self if all(getattr(record, key) == value for key, value in filter.items())]
+
+    def get_issues_by_status(self, status):
+        """
+        :param status: The IssueStatus enum
+        :return: A list of IssueRecords with the specified status
+        """
+        return self.get_issues({"status": status})
+
+class AgentSnapshot(_Snapshot):
+    """
+    Point-in-time view of all agents.
+    """
+    def get_agent_by_id(self, agent_id):
+        """
+        :param agent_id: The unique ID of the agent
+        :return: The AgentRecord, if found
+        """
+        return self._get(agent_id)
+
+    def view_agents_work_history(self):
+        """
+        :return: A dictionary mapping agent names to the IDs of the issues they worked on
+        """
+        return {record.name: list(record.work_history) for record in self}
+
+def take_read_view(issue_manager, agent_manager):
+    """
+    Takes mutually consistent snapshots of issues and agents.
+
+    Assignments and resolutions change agents and issues under the IssueManager lock, so holding it
+    while both snapshots are taken guarantees that they reflect the same point in time.
+
+    :param issue_manager: The IssueManager instance
+    :param agent_manager: The AgentManager instance
+    :return: A ReadView of (IssueSnapshot, AgentSnapshot)
+    """
+    with issue_manager.lock:
+        return ReadView(issue_manager.snapshot(), agent_manager.snapshot())
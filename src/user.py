@@ -20,9 +20,25 @@ class User:
         :param email: The email address of the user
         :param name: The name of the user
         """
+        self._init_state(email, name)
+        logging.info(f"User created: {self.name} with email {self.email}")
+
+    @classmethod
+    def from_roster(cls, email, name):
+        """
+        Creates a user while bulk-loading a roster, without the per-user log line.
+
+        :param email: The email address of the user
+        :param name: The name of the user
+        :return: The created User object
+        """
+        user = cls.__new__(cls)
+        user._init_state(email, name)
+        return user
+
+    def _init_state(self, email, name):
         self.email = email
         self.name = name
-        logging.info(f"User created: {self.name} with email {self.email}")
 
     def raise_issue(self, issue_manager, transaction_id, issue_type, subject, description):
         """
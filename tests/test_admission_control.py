@@ -0,0 +1,127 @@
+import unittest
+import sys
+
+try:
+    from admission_control import AdmissionController, AdmissionRejected, AdmissionResult, LoadSheddingPolicy
+    from issue import IssueStatus
+    from issue_manager import IssueManager
+    from issue_type import IssueType
+except ImportError:
+    sys.path.insert(0, 'src')
+    from admission_control import AdmissionController, AdmissionRejected, AdmissionResult, LoadSheddingPolicy
+    from issue import IssueStatus
+    from issue_manager import IssueManager
+    from issue_type import IssueType
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestAdmissionControl(unittest.TestCase):
+
+    def create_issue(self, issue_manager, transaction_id, email="user@test.com"):
+        return issue_manager.create_issue(transaction_id, IssueType.PAYMENT_RELATED, "Payment Failed", "Payment failed", email)
+
+    def test_user_rate_limit(self):
+        clock = FakeClock()
+        issue_manager = IssueManager(admission_controller=AdmissionController(user_rate=1, user_burst=2, clock=clock))
+        self.create_issue(issue_manager, "T1")
+        self.create_issue(issue_manager, "T2")
+
+        with self.assertRaises(AdmissionRejected) as context:
+            self.create_issue(issue_manager, "T3")
+        self.assertAlmostEqual(context.exception.retry_after, 1.0)
+        # Other users are not affected, and the bucket refills over time
+        self.create_issue(issue_manager, "T3", email="other@test.com")
+        clock.now = 1.0
+        self.create_issue(issue_manager, "T3")
+
+    def test_full_waitlist_rejects(self):
+        issue_manager = IssueManager(admission_controller=AdmissionController(waitlist_limits={IssueType.PAYMENT_RELATED: 1}))
+        first = self.create_issue(issue_manager, "T1")
+        second = self.create_issue(issue_manager, "T2")
+
+        self.assertEqual(issue_manager.add_to_waitlist(first), AdmissionResult.QUEUED)
+        with self.assertRaises(AdmissionRejected) as context:
+            issue_manager.add_to_waitlist(second)
+        self.assertGreater(context.exception.retry_after, 0)
+
+    def test_rejected_issue_is_removed(self):
+        issue_manager = IssueManager(admission_controller=AdmissionController(default_waitlist_limit=0))
+        rejected = self.create_issue(issue_manager, "T1")
+        with self.assertRaises(AdmissionRejected):
+            issue_manager.add_to_waitlist(rejected)
+
+        self.assertIsNone(issue_manager.get_issue_by_id(rejected.issue_id))
+        self.assertEqual(issue_manager.get_issues_by_status(IssueStatus.OPEN), [])
+        self.assertEqual(list(issue_manager.query_issues()), [])
+        self.assertEqual(issue_manager.search_issues("payment"), [])
+        # A retry of the same request is new work rather than a follow-up of the rejected issue
+        retry = self.create_issue(issue_manager, "T1")
+        self.assertIsNone(retry.duplicate_of)
+
+    def test_retry_hint_grows_with_waitlist_depth(self):
+        clock = FakeClock()
+        controller = AdmissionController(clock=clock)
+        for _ in range(3):
+            controller.record_dequeue(IssueType.PAYMENT_RELATED)
+            clock.now += 2.0
+        self.assertAlmostEqual(controller.waitlist_retry_after(IssueType.PAYMENT_RELATED, 1), 2.0)
+        self.assertAlmostEqual(controller.waitlist_retry_after(IssueType.PAYMENT_RELATED, 10), 20.0)
+
+    def test_waiting_issue_is_queued_once(self):
+        issue_manager = IssueManager()
+        issue = self.create_issue(issue_manager, "T1")
+        for _ in range(3):
+            self.assertEqual(issue_manager.add_to_waitlist(issue), AdmissionResult.QUEUED)
+
+        self.assertIs(issue_manager.get_next_waiting_issue(), issue)
+        self.assertIsNone(issue_manager.get_next_waiting_issue())
+        # An issue put back after a failed reassignment is queued again
+        issue_manager.add_to_waitlist(issue)
+        self.assertIs(issue_manager.get_next_waiting_issue(), issue)
+
+    def test_full_waitlist_defers_until_room(self):
+        controller = AdmissionController(default_waitlist_limit=1, shedding_policy=LoadSheddingPolicy.DEFER)
+        issue_manager = IssueManager(admission_controller=controller)
+        first = self.create_issue(issue_manager, "T1")
+        second = self.create_issue(issue_manager, "T2")
+
+        issue_manager.add_to_waitlist(first)
+        self.assertEqual(issue_manager.add_to_waitlist(second), AdmissionResult.DEFERRED)
+        self.assertEqual(issue_manager.get_waitlist_depth(IssueType.PAYMENT_RELATED), (1, 1))
+
+        self.assertIs(issue_manager.get_next_waiting_issue(), first)
+        issue_manager.resolve_issue(first.issue_id, "Refunded")
+        self.assertEqual(second.status, IssueStatus.WAITING)
+        self.assertIs(issue_manager.get_next_waiting_issue(), second)
+
+    def test_full_overflow_rejects(self):
+        controller = AdmissionController(default_waitlist_limit=0, overflow_limit=1, shedding_policy=LoadSheddingPolicy.DEFER)
+        issue_manager = IssueManager(admission_controller=controller)
+        first = self.create_issue(issue_manager, "T1")
+        second = self.create_issue(issue_manager, "T2")
+
+        self.assertEqual(issue_manager.add_to_waitlist(first), AdmissionResult.DEFERRED)
+        # Deferring the same issue again does not take another overflow slot
+        self.assertEqual(issue_manager.add_to_waitlist(first), AdmissionResult.DEFERRED)
+        self.assertEqual(issue_manager.get_waitlist_depth(IssueType.PAYMENT_RELATED), (0, 1))
+        with self.assertRaises(AdmissionRejected):
+            issue_manager.add_to_waitlist(second)
+        self.assertIsNone(issue_manager.get_issue_by_id(second.issue_id))
+
+    def test_full_waitlist_auto_acknowledges(self):
+        controller = AdmissionController(default_waitlist_limit=0, shedding_policy=LoadSheddingPolicy.AUTO_ACKNOWLEDGE)
+        issue_manager = IssueManager(admission_controller=controller)
+        issue = self.create_issue(issue_manager, "T1")
+
+        self.assertEqual(issue_manager.add_to_waitlist(issue), AdmissionResult.AUTO_ACKNOWLEDGED)
+        self.assertEqual(issue.status, IssueStatus.OPEN)
+        self.assertIsNone(issue.resolution)
+        self.assertEqual(issue_manager.get_waitlist_depth(IssueType.PAYMENT_RELATED), (0, 1))
+
+if __name__ == "__main__":
+    unittest.main()
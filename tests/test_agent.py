@@ -3,12 +3,12 @@ import sys
 
 try:
     from agent import Agent, AgentStatus
-    from issue import Issue
+    from issue import Issue, IssueStatus
     from issue_type import IssueType
 except ImportError:
     sys.path.insert(0, 'src')
     from agent import Agent, AgentStatus
-    from issue import Issue
+    from issue import Issue, IssueStatus
     from issue_type import IssueType
 
 class TestAgent(unittest.TestCase):
@@ -29,6 +29,7 @@ class TestAgent(unittest.TestCase):
         self.agent.assign_issue(issue)
         self.assertEqual(self.agent.current_issue, issue)
         self.assertEqual(self.agent.status, AgentStatus.BUSY)
+        self.assertEqual(issue.status, IssueStatus.IN_PROGRESS)
 
     def test_resolve_issue(self):
         issue = Issue(transaction_id="T1", issue_type=IssueType.PAYMENT_RELATED, subject="Payment Failed", description="Payment failed", email="user@test.com")
@@ -0,0 +1,76 @@
+import unittest
+import sys
+
+try:
+    from agent_manager import AgentManager
+    from event_stream import EventStream, EventType, SubscriptionDropped
+    from issue_manager import IssueManager
+    from issue_type import IssueType
+except ImportError:
+    sys.path.insert(0, 'src')
+    from agent_manager import AgentManager
+    from event_stream import EventStream, EventType, SubscriptionDropped
+    from issue_manager import IssueManager
+    from issue_type import IssueType
+
+class TestEventStream(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = EventStream(capacity=4)
+
+    def publish(self, count):
+        for i in range(count):
+            self.stream.publish(EventType.ISSUE_CREATED, f"I{i}")
+
+    def test_independent_subscribers_read_in_batches(self):
+        first = self.stream.subscribe()
+        self.publish(3)
+        second = self.stream.subscribe(from_beginning=True)
+
+        self.assertEqual([event.sequence for event in first.read(max_events=2)], [0, 1])
+        self.assertEqual([event.entity_id for event in second.read()], ["I0", "I1", "I2"])
+        self.assertEqual(first.lag, 1)
+        self.assertEqual([event.sequence for event in first.read()], [2])
+        self.assertEqual(first.read(), [])
+
+    def test_slow_subscriber_skips_overwritten_events(self):
+        subscription = self.stream.subscribe()
+        self.publish(6)
+        self.assertEqual([event.sequence for event in subscription.read()], [2, 3, 4, 5])
+        self.assertEqual(subscription.missed, 2)
+
+    def test_slow_subscriber_can_be_dropped(self):
+        subscription = self.stream.subscribe(drop_if_lagging=True)
+        self.publish(5)
+        with self.assertRaises(SubscriptionDropped):
+            subscription.read()
+        with self.assertRaises(SubscriptionDropped):
+            subscription.read()
+
+    def test_issue_lifecycle_is_published(self):
+        stream = EventStream()
+        issue_manager = IssueManager(event_stream=stream)
+        agent_manager = AgentManager(event_stream=stream)
+        agent = agent_manager.add_agent("agent@test.com", "Test Agent", [IssueType.PAYMENT_RELATED])
+        subscription = stream.subscribe()
+
+        issue = issue_manager.create_issue("T1", IssueType.PAYMENT_RELATED, "Payment Failed", "Payment failed", "user@test.com")
+        issue_manager.add_to_waitlist(issue)
+        issue_manager.assign_issue_to_agent(issue, agent)
+        issue_manager.resolve_issue(issue.issue_id, "Refunded")
+
+        events = subscription.read()
+        self.assertEqual([event.event_type for event in events], [
+            EventType.ISSUE_CREATED,
+            EventType.ISSUE_WAITLISTED,
+            EventType.AGENT_BUSY,
+            EventType.ISSUE_ASSIGNED,
+            EventType.ISSUE_STATUS_UPDATED,
+            EventType.ISSUE_RESOLVED,
+            EventType.AGENT_FREE,
+        ])
+        self.assertEqual(events[-2].data["resolution"], "Refunded")
+        self.assertEqual(events[-1].entity_id, agent.agent_id)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -39,5 +39,13 @@ class TestIssue(unittest.TestCase):
         self.assertEqual(self.issue.status, IssueStatus.RESOLVED)
         self.assertEqual(self.issue.resolution, "Refunded")
 
+    def test_timestamps(self):
+        self.assertIsNotNone(self.issue.created_at)
+        self.assertIsNone(self.issue.assigned_at)
+        self.assertIsNone(self.issue.resolved_at)
+
+        self.issue.update_status(IssueStatus.RESOLVED, resolution="Refunded")
+        self.assertGreaterEqual(self.issue.resolved_at, self.issue.created_at)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+import sys
+
+try:
+    from agent import Agent, AgentStatus
+    from issue import InvalidStatusTransition, IssueStatus
+    from issue_manager import IssueManager
+    from issue_type import IssueType
+except ImportError:
+    sys.path.insert(0, 'src')
+    from agent import Agent, AgentStatus
+    from issue import InvalidStatusTransition, IssueStatus
+    from issue_manager import IssueManager
+    from issue_type import IssueType
+
+class TestIssueManager(unittest.TestCase):
+
+    def setUp(self):
+        self.issue_manager = IssueManager()
+
+    def create_payment_issue(self, transaction_id="T1", email="user@test.com"):
+        return self.issue_manager.create_issue(transaction_id, IssueType.PAYMENT_RELATED, "Payment Failed", "Payment failed but money debited", email)
+
+    def test_duplicate_issue_is_attached_as_follow_up(self):
+        primary = self.create_payment_issue()
+        duplicate = self.create_payment_issue()
+
+        self.assertIsNone(primary.duplicate_of)
+        self.assertEqual(duplicate.duplicate_of, primary.issue_id)
+        self.assertEqual(primary.follow_ups, [duplicate])
+
+    def test_different_transaction_is_not_coalesced(self):
+        self.create_payment_issue(transaction_id="T1")
+        other = self.create_payment_issue(transaction_id="T3")
+        self.assertIsNone(other.duplicate_of)
+
+    def test_resolving_primary_resolves_follow_ups(self):
+        primary = self.create_payment_issue()
+        duplicate = self.create_payment_issue()
+
+        self.issue_manager.resolve_issue(primary.issue_id, "Refunded")
+
+        self.assertEqual(duplicate.status, IssueStatus.RESOLVED)
+        self.assertEqual(duplicate.resolution, "Refunded")
+        # A new report after resolution starts a fresh issue
+        self.assertIsNone(self.create_payment_issue().duplicate_of)
+
+    def test_dedup_window_expiry(self):
+        self.issue_manager = IssueManager(dedup_window=0)
+        self.create_payment_issue()
+        self.assertIsNone(self.create_payment_issue().duplicate_of)
+
+    def test_search_issues_with_filter(self):
+        open_issue = self.create_payment_issue(transaction_id="T1")
+        resolved_issue = self.create_payment_issue(transaction_id="T2")
+        self.issue_manager.create_issue("T3", IssueType.GOLD_RELATED, "Gold Purchase Failed", "Unable to purchase gold", "user@test.com")
+        self.issue_manager.resolve_issue(resolved_issue.issue_id, "Refunded")
+
+        self.assertCountEqual(self.issue_manager.search_issues("debited"), [open_issue, resolved_issue])
+        self.assertEqual(self.issue_manager.search_issues("debited", {"status": IssueStatus.OPEN}), [open_issue])
+        self.assertEqual(len(self.issue_manager.search_issues("fail*", limit=2)), 2)
+        self.assertEqual(len(self.issue_manager.search_issues("fail*", offset=2)), 1)
+
+    def test_query_issues_is_lazy_and_resumable(self):
+        issues = [self.create_payment_issue(transaction_id=f"T{i}") for i in range(5)]
+
+        cursor = self.issue_manager.query_issues({"status": IssueStatus.OPEN}, limit=2)
+        self.assertEqual(list(cursor), issues[:2])
+
+        # Issues created after the cursor was handed out are picked up on resume
+        issues.append(self.create_payment_issue(transaction_id="T5"))
+        resumed = self.issue_manager.query_issues(cursor=cursor.token)
+        self.assertEqual(resumed.fetch(10), issues[2:])
+        self.assertEqual(list(self.issue_manager.query_issues(offset=4)), issues[4:])
+
+    def test_open_cursor_survives_issue_removal(self):
+        issues = [self.create_payment_issue(transaction_id=f"T{i}") for i in range(4)]
+        self.issue_manager.update_issue(issues[2].issue_id, IssueStatus.RESOLVED, "Refunded")
+        cursor = self.issue_manager.query_issues()
+        self.assertEqual(cursor.fetch(1), issues[:1])
+
+        self.issue_manager.compact_partitions(0, now=issues[0].created_at + 2 * self.issue_manager.PARTITION_SECONDS)
+        issues.append(self.create_payment_issue(transaction_id="T4"))
+
+        self.assertEqual(list(cursor), [issues[1], issues[3], issues[4]])
+
+    def test_query_issues_rejects_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            self.issue_manager.query_issues(cursor="not-a-token")
+
+    def test_get_issues_by_status_returns_copy(self):
+        issue = self.create_payment_issue()
+        open_issues = self.issue_manager.get_issues_by_status(IssueStatus.OPEN)
+        self.issue_manager.add_to_waitlist(issue)
+        self.assertEqual(open_issues, [issue])
+
+    def test_cached_filters_are_invalidated_by_mutations(self):
+        issue = self.create_payment_issue()
+        self.assertEqual(self.issue_manager.get_issues({"status": IssueStatus.OPEN}), [issue])
+        self.assertEqual(self.issue_manager.get_issues({"status": IssueStatus.OPEN}), [issue])
+        self.assertEqual(self.issue_manager.get_cache_stats()["hits"], 1)
+
+        self.issue_manager.add_to_waitlist(issue)
+        self.assertEqual(self.issue_manager.get_issues({"status": IssueStatus.OPEN}), [])
+        self.assertEqual(self.issue_manager.get_issues_by_status(IssueStatus.WAITING), [issue])
+
+        other = self.create_payment_issue(transaction_id="T2")
+        self.assertEqual(self.issue_manager.get_issues({"status": IssueStatus.OPEN}), [other])
+
+    def test_multi_attribute_filters_are_invalidated(self):
+        issue = self.create_payment_issue()
+        other = self.create_payment_issue(transaction_id="T2", email="other@test.com")
+        unresolved = {"status": IssueStatus.OPEN, "resolution": None}
+        self.assertEqual(self.issue_manager.get_issues(unresolved), [issue, other])
+        self.assertEqual(self.issue_manager.get_issues({"email": "other@test.com", "status": IssueStatus.OPEN}), [other])
+        self.assertEqual(self.issue_manager.get_issues({"resolved_at": None}), [issue, other])
+
+        self.issue_manager.update_issue(issue.issue_id, IssueStatus.RESOLVED, "Refunded")
+
+        self.assertEqual(self.issue_manager.get_issues(unresolved), [other])
+        self.assertEqual(self.issue_manager.get_issues({"resolved_at": None}), [other])
+        # The other user's cached result was not affected by the change
+        hits = self.issue_manager.get_cache_stats()["hits"]
+        self.assertEqual(self.issue_manager.get_issues({"email": "other@test.com", "status": IssueStatus.OPEN}), [other])
+        self.assertEqual(self.issue_manager.get_cache_stats()["hits"], hits + 1)
+
+    def test_update_issue_follows_the_lifecycle(self):
+        agent = Agent(email="agent@test.com", name="Test Agent", expertise=[IssueType.PAYMENT_RELATED])
+        first = self.create_payment_issue(transaction_id="T1")
+        second = self.create_payment_issue(transaction_id="T2")
+        self.issue_manager.assign_issue_to_agent(first, agent)
+        self.issue_manager.update_issue(second.issue_id, IssueStatus.WAITING)
+        self.assertIs(self.issue_manager.get_next_waiting_issue(), second)
+        self.issue_manager.add_to_waitlist(second)
+
+        with self.assertRaises(InvalidStatusTransition):
+            self.issue_manager.update_issue(first.issue_id, IssueStatus.OPEN)
+        with self.assertRaises(InvalidStatusTransition):
+            self.issue_manager.update_issue(second.issue_id, IssueStatus.IN_PROGRESS)
+
+        self.issue_manager.update_issue(first.issue_id, IssueStatus.RESOLVED, "Refunded")
+        self.assertEqual(first.status, IssueStatus.RESOLVED)
+        self.assertIs(agent.current_issue, second)
+        self.assertEqual(second.status, IssueStatus.IN_PROGRESS)
+
+    def test_resolve_issue_frees_agent_and_assigns_next_waiting_issue(self):
+        agent = Agent(email="agent@test.com", name="Test Agent", expertise=[IssueType.PAYMENT_RELATED])
+        first = self.create_payment_issue(transaction_id="T1")
+        gold = self.issue_manager.create_issue("T2", IssueType.GOLD_RELATED, "Gold Purchase Failed", "Unable to purchase gold", "user@test.com")
+        second = self.create_payment_issue(transaction_id="T3")
+
+        self.issue_manager.assign_issue_to_agent(first, agent)
+        self.assertEqual(first.status, IssueStatus.IN_PROGRESS)
+        self.assertEqual(self.issue_manager.get_issues_by_status(IssueStatus.IN_PROGRESS), [first])
+
+        self.issue_manager.add_to_waitlist(gold)
+        self.issue_manager.add_to_waitlist(second)
+        next_issue = self.issue_manager.resolve_issue(first.issue_id, "Refunded")
+
+        self.assertEqual(first.status, IssueStatus.RESOLVED)
+        self.assertEqual(first.resolution, "Refunded")
+        # The gold issue waited longer but the agent lacks the expertise
+        self.assertIs(next_issue, second)
+        self.assertIs(agent.current_issue, second)
+        self.assertEqual(agent.status, AgentStatus.BUSY)
+        self.assertEqual(self.issue_manager.get_issues_by_status(IssueStatus.RESOLVED), [first])
+        self.assertEqual(self.issue_manager.get_issues_by_status(IssueStatus.WAITING), [gold])
+        self.assertIs(self.issue_manager.get_next_waiting_issue(), gold)
+        self.assertIsNone(self.issue_manager.get_next_waiting_issue())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import sys
+import time
+from types import SimpleNamespace
+
+try:
+    from issue import IssueStatus
+    from issue_manager import IssueManager
+    from issue_type import IssueType
+    from partitioned_store import PartitionCompactor, TimePartitionedStore
+except ImportError:
+    sys.path.insert(0, 'src')
+    from issue import IssueStatus
+    from issue_manager import IssueManager
+    from issue_type import IssueType
+    from partitioned_store import PartitionCompactor, TimePartitionedStore
+
+DAY = 24 * 60 * 60
+
+class TestTimePartitionedStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = TimePartitionedStore(partition_seconds=100)
+        for issue_id, created_at in [("a", 10), ("b", 150), ("c", 199), ("d", 250), ("e", 420)]:
+            self.store.add(SimpleNamespace(issue_id=issue_id, created_at=created_at))
+
+    def ids(self, issues):
+        return [issue.issue_id for issue in issues]
+
+    def test_partitions_by_creation_time(self):
+        self.assertEqual(self.store.starts, [0, 100, 200, 400])
+        self.assertEqual(len(self.store), 5)
+
+    def test_get_range(self):
+        self.assertEqual(self.ids(self.store.get_range(150, 251)), ["b", "c", "d"])
+        self.assertEqual(self.ids(self.store.get_range(100, 200)), ["b", "c"])
+        self.assertEqual(self.ids(self.store.get_range(end=150)), ["a"])
+        self.assertEqual(self.ids(self.store.get_range(start=300)), ["e"])
+
+    def test_drop_expired_keeps_retained_issues(self):
+        dropped = self.store.drop_expired(300, keep=lambda issue: issue.issue_id == "c")
+        self.assertEqual([(start, self.ids(issues)) for start, issues in dropped], [(0, ["a"]), (100, ["b"]), (200, ["d"])])
+        self.assertEqual(self.store.starts, [100, 400])
+        self.assertEqual(self.ids(self.store.get_range()), ["c", "e"])
+
+class TestPartitionCompaction(unittest.TestCase):
+
+    def setUp(self):
+        self.issue_manager = IssueManager(dedup_window=None)
+
+    def create_issue(self, transaction_id):
+        return self.issue_manager.create_issue(transaction_id, IssueType.PAYMENT_RELATED, "Payment Failed", "Payment failed", "user@test.com")
+
+    def test_get_issues_created_between(self):
+        issue = self.create_issue("T1")
+        self.assertEqual(self.issue_manager.get_issues_created_between(time.time() - 60), [issue])
+        self.assertEqual(self.issue_manager.get_issues_created_between(end=issue.created_at), [])
+        self.assertEqual(self.issue_manager.get_issues_created_between(filter={"status": IssueStatus.RESOLVED}), [])
+
+    def test_compaction_drops_resolved_issues_and_keeps_open_ones(self):
+        resolved = self.create_issue("T1")
+        still_open = self.create_issue("T2")
+        self.issue_manager.update_issue(resolved.issue_id, IssueStatus.RESOLVED, "Refunded")
+        self.assertEqual(len(self.issue_manager.get_issues({"email": "user@test.com"})), 2)
+
+        self.assertEqual(self.issue_manager.compact_partitions(DAY), 0)
+        archived = []
+        dropped = self.issue_manager.compact_partitions(DAY, now=time.time() + 2 * DAY,
+                                                        archive=lambda start, issues: archived.extend(issues))
+
+        self.assertEqual(dropped, 1)
+        self.assertEqual(archived, [resolved])
+        self.assertIsNone(self.issue_manager.get_issue_by_id(resolved.issue_id))
+        self.assertEqual(self.issue_manager.get_issues({"email": "user@test.com"}), [still_open])
+        self.assertEqual(self.issue_manager.get_issues_by_status(IssueStatus.RESOLVED), [])
+        self.assertEqual(list(self.issue_manager.query_issues()), [still_open])
+        self.assertEqual(self.issue_manager.search_issues("payment"), [still_open])
+        self.assertEqual(len(self.issue_manager.snapshot()), 1)
+
+    def test_compaction_keeps_interleaved_open_issues_in_order(self):
+        issues = [self.create_issue(f"T{i}") for i in range(5)]
+        for issue in issues[1:4:2]:
+            self.issue_manager.update_issue(issue.issue_id, IssueStatus.RESOLVED, "Refunded")
+        later = self.create_issue("T5")
+
+        self.assertEqual(self.issue_manager.compact_partitions(DAY, now=time.time() + 2 * DAY), 2)
+        self.assertEqual(list(self.issue_manager.query_issues()), [issues[0], issues[2], issues[4], later])
+
+    def test_issue_log_is_rebuilt_once_half_of_it_is_dropped(self):
+        issues = [self.create_issue(f"T{i}") for i in range(2 * IssueManager.MIN_LOG_COMPACTION)]
+        for issue in issues[:IssueManager.MIN_LOG_COMPACTION - 1]:
+            self.issue_manager.update_issue(issue.issue_id, IssueStatus.RESOLVED, "Refunded")
+        issue_log = self.issue_manager.issue_log
+        self.issue_manager.compact_partitions(DAY, now=time.time() + 2 * DAY)
+        # Dropped issues are left in place until they make up half of the log
+        self.assertIs(self.issue_manager.issue_log, issue_log)
+        self.assertEqual(len(issue_log), len(issues))
+
+        self.issue_manager.update_issue(issues[-1].issue_id, IssueStatus.RESOLVED, "Refunded")
+        self.issue_manager.compact_partitions(DAY, now=time.time() + 2 * DAY)
+        self.assertEqual(self.issue_manager.issue_log, issues[IssueManager.MIN_LOG_COMPACTION - 1:-1])
+        self.assertEqual(self.issue_manager.dead_log_entries, 0)
+
+    def test_background_compactor(self):
+        issue = self.create_issue("T1")
+        self.issue_manager.update_issue(issue.issue_id, IssueStatus.RESOLVED, "Refunded")
+        compactor = PartitionCompactor(self.issue_manager, retention_seconds=-DAY, interval_seconds=0.01)
+        compactor.start()
+        try:
+            deadline = time.time() + 5
+            while self.issue_manager.get_issue_by_id(issue.issue_id) is not None and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            compactor.stop()
+        self.assertIsNone(self.issue_manager.get_issue_by_id(issue.issue_id))
+
+if __name__ == "__main__":
+    unittest.main()
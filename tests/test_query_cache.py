@@ -0,0 +1,78 @@
+import unittest
+import sys
+from types import SimpleNamespace
+
+try:
+    from query_cache import QueryCache
+except ImportError:
+    sys.path.insert(0, 'src')
+    from query_cache import QueryCache
+
+class TestQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = QueryCache(max_entries=2)
+
+    def put(self, criteria, issues):
+        key = self.cache.make_key("issues", criteria)
+        self.cache.put(key, criteria, issues, self.cache.generation)
+        return key
+
+    def test_hit_and_miss_statistics(self):
+        key = self.cache.make_key("issues", {"status": "Open"})
+        self.assertIsNone(self.cache.get(key))
+        self.put({"status": "Open"}, ["I1"])
+        self.assertEqual(self.cache.get(key), ["I1"])
+
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_filter_key_is_order_independent(self):
+        self.assertEqual(
+            self.cache.make_key("issues", {"status": "Open", "email": "a"}),
+            self.cache.make_key("issues", {"email": "a", "status": "Open"}),
+        )
+        self.assertIsNone(self.cache.make_key("issues", {"status": ["unhashable"]}))
+
+    def test_lru_eviction(self):
+        first = self.put({"email": "a"}, [])
+        second = self.put({"email": "b"}, [])
+        self.cache.get(first)
+        self.put({"email": "c"}, [])
+
+        self.assertIsNotNone(self.cache.get(first))
+        self.assertIsNone(self.cache.get(second))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_invalidation_is_limited_to_affected_values(self):
+        open_key = self.put({"status": "Open"}, ["I1"])
+        waiting_key = self.put({"status": "Waiting"}, [])
+
+        self.cache.invalidate_attribute(SimpleNamespace(status="In Progress"), "status", "Open", "In Progress")
+
+        self.assertIsNone(self.cache.get(open_key))
+        self.assertEqual(self.cache.get(waiting_key), [])
+
+    def test_invalidation_is_limited_to_entries_matching_the_issue(self):
+        cache = QueryCache(max_entries=8)
+        keys = {}
+        for email in ("a", "b"):
+            criteria = {"status": "Open", "email": email}
+            keys[email] = cache.make_key("issues", criteria)
+            cache.put(keys[email], criteria, [], cache.generation)
+
+        cache.invalidate_attribute(SimpleNamespace(status="Waiting", email="a"), "status", "Open", "Waiting")
+
+        self.assertIsNone(cache.get(keys["a"]))
+        self.assertEqual(cache.get(keys["b"]), [])
+
+    def test_result_computed_during_invalidation_is_discarded(self):
+        key = self.cache.make_key("issues", {"status": "Open"})
+        generation = self.cache.generation
+        self.cache.invalidate_attribute(SimpleNamespace(status="Waiting"), "status", "Open", "Waiting")
+        self.cache.put(key, {"status": "Open"}, ["stale"], generation)
+        self.assertIsNone(self.cache.get(key))
+
+if __name__ == "__main__":
+    unittest.main()
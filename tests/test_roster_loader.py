@@ -0,0 +1,81 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+import uuid
+
+try:
+    from agent_manager import AgentManager
+    from issue_type import IssueType
+    from roster_loader import DEFAULT_ROSTER_PATH, RosterFormatError, iter_roster, load_roster, new_agent_ids, read_roster_snapshot
+except ImportError:
+    sys.path.insert(0, 'src')
+    from agent_manager import AgentManager
+    from issue_type import IssueType
+    from roster_loader import DEFAULT_ROSTER_PATH, RosterFormatError, iter_roster, load_roster, new_agent_ids, read_roster_snapshot
+
+class TestRosterLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.directory.name, "roster.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_roster(self, data):
+        path = os.path.join(self.directory.name, "roster.json")
+        with open(path, "w") as file:
+            json.dump(data, file)
+        return path
+
+    def test_streaming_matches_json_load(self):
+        with open(DEFAULT_ROSTER_PATH) as file:
+            data = json.load(file)
+        # A tiny chunk size forces entries to be split across reads
+        entries = list(iter_roster(DEFAULT_ROSTER_PATH, chunk_size=7))
+        self.assertEqual([entry for section, entry in entries if section == "agents"], data["agents"])
+        self.assertEqual([entry for section, entry in entries if section == "users"], data["users"])
+
+    def test_new_agent_ids_are_unique_uuid4(self):
+        ids = new_agent_ids(100)
+        self.assertEqual(len(set(ids)), 100)
+        self.assertTrue(all(uuid.UUID(agent_id).version == 4 for agent_id in ids))
+
+    def test_invalid_roster(self):
+        path = self.write_roster([])
+        with self.assertRaises(RosterFormatError):
+            list(iter_roster(path))
+
+    def test_load_roster_builds_expertise_index(self):
+        agent_manager = AgentManager()
+        users = load_roster(agent_manager, path=DEFAULT_ROSTER_PATH)
+
+        self.assertEqual(len(agent_manager.agents), 20)
+        self.assertEqual(len(users), 5)
+        self.assertEqual(users[0].email, "testUser1@test.com")
+        gold_agents = agent_manager.get_free_agents(IssueType.GOLD_RELATED)
+        self.assertTrue(gold_agents)
+        self.assertTrue(all(IssueType.GOLD_RELATED in agent.expertise for agent in gold_agents))
+
+    def test_snapshot_is_used_until_source_changes(self):
+        path = self.write_roster({"agents": [{"email": "a@test.com", "name": "A", "expertise": ["Gold Related"]}], "users": []})
+        load_roster(AgentManager(), path=path, snapshot_path=self.snapshot_path)
+        agent_ids, agent_rows, user_rows = read_roster_snapshot(self.snapshot_path, path)
+        self.assertEqual(agent_rows, [("a@test.com", "A", ("Gold Related",))])
+        self.assertEqual(user_rows, [])
+        # Agent IDs are restored from the snapshot on warm starts
+        agent_manager = AgentManager()
+        load_roster(agent_manager, path=path, snapshot_path=self.snapshot_path)
+        self.assertEqual(list(agent_manager.agents), agent_ids)
+
+        path = self.write_roster({"agents": [], "users": [{"email": "u@test.com", "name": "U"}]})
+        os.utime(path, ns=(0, 0))
+        self.assertIsNone(read_roster_snapshot(self.snapshot_path, path))
+        users = load_roster(AgentManager(), path=path, snapshot_path=self.snapshot_path)
+        self.assertEqual([user.email for user in users], ["u@test.com"])
+        self.assertIsNotNone(read_roster_snapshot(self.snapshot_path, path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import sys
+
+try:
+    from search_index import SearchIndex, tokenize
+except ImportError:
+    sys.path.insert(0, 'src')
+    from search_index import SearchIndex, tokenize
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.add("I1", "Payment Failed", "My payment failed but money is debited")
+        self.index.add("I2", "Purchase Failed", "Unable to purchase Mutual Fund")
+        self.index.add("I3", "Refund pending", "Money debited twice, refund requested")
+
+    def search_ids(self, query):
+        return [doc_id for doc_id, _ in self.index.search(query)]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Money is DEBITED!"), ["money", "is", "debited"])
+
+    def test_term_query(self):
+        self.assertCountEqual(self.search_ids("debited"), ["I1", "I3"])
+        self.assertCountEqual(self.search_ids("failed debited"), ["I1"])
+
+    def test_prefix_query(self):
+        self.assertCountEqual(self.search_ids("purch*"), ["I2"])
+        self.assertCountEqual(self.search_ids("refu*"), ["I3"])
+
+    def test_phrase_query(self):
+        self.assertEqual(self.search_ids('"money is debited"'), ["I1"])
+        self.assertEqual(self.search_ids('"debited money"'), [])
+        # Phrases do not span subject and description
+        self.assertEqual(self.search_ids('"failed my"'), [])
+
+    def test_subject_matches_rank_higher(self):
+        self.assertEqual(self.search_ids("payment")[0], "I1")
+        self.assertEqual(self.search_ids("refund"), ["I3"])
+
+    def test_remove(self):
+        self.index.remove("I1")
+        self.assertEqual(self.search_ids("debited"), ["I3"])
+        self.assertEqual(self.search_ids("payment"), [])
+        self.assertNotIn("payment", self.index.sorted_terms)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import sys
+import threading
+import unittest
+
+try:
+    from admission_control import AdmissionController
+    from agent_assignment_strategy import AgentAssignmentStrategy
+    from agent_manager import AgentManager
+    from issue_manager import IssueManager
+    from issue_type import IssueType
+    from service import IssueService, ServiceError
+except ImportError:
+    sys.path.insert(0, 'src')
+    from admission_control import AdmissionController
+    from agent_assignment_strategy import AgentAssignmentStrategy
+    from agent_manager import AgentManager
+    from issue_manager import IssueManager
+    from issue_type import IssueType
+    from service import IssueService, ServiceError
+
+class TestIssueService(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.issue_manager = IssueManager()
+        self.agent_manager = AgentManager()
+        strategy = AgentAssignmentStrategy(self.agent_manager, self.issue_manager)
+        self.service = IssueService(self.issue_manager, self.agent_manager, strategy)
+        port = await self.service.start(port=0)
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.service.close()
+
+    async def request(self, method, path, body=None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(payload)}\r\n\r\n".encode() + payload)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) != b"\r\n":
+            name, _, value = line.decode().partition(":")
+            headers[name.lower()] = value.strip()
+        self.last_headers = headers
+        return status, json.loads(await self.reader.readexactly(int(headers["content-length"])))
+
+    def issue_body(self, transaction_id):
+        return {"transaction_id": transaction_id, "issue_type": IssueType.PAYMENT_RELATED, "subject": "Payment Failed",
+                "description": "Payment failed", "email": "user@test.com"}
+
+    async def test_issue_lifecycle_over_one_connection(self):
+        status, issue = await self.request("POST", "/issues", self.issue_body("T1"))
+        self.assertEqual((status, issue["status"]), (201, "Waiting"))
+
+        status, agent = await self.request("POST", "/agents", {"email": "agent@test.com", "name": "Test Agent", "expertise": [IssueType.PAYMENT_RELATED]})
+        self.assertEqual((status, agent["current_issue_id"]), (201, issue["issue_id"]))
+
+        status, issues = await self.request("GET", "/issues?status=In+Progress")
+        self.assertEqual([found["issue_id"] for found in issues], [issue["issue_id"]])
+
+        status, resolved = await self.request("POST", f"/issues/{issue['issue_id']}/resolve", {"resolution": "Refunded"})
+        self.assertEqual(resolved["issue"]["status"], "Resolved")
+        self.assertIsNone(resolved["next_issue"])
+
+        status, history = await self.request("GET", "/agents/work-history")
+        self.assertEqual(history, {"Test Agent": [issue["issue_id"]]})
+
+    async def test_update_issue_and_errors(self):
+        _, issue = await self.request("POST", "/issues", self.issue_body("T1"))
+        status, updated = await self.request("PATCH", f"/issues/{issue['issue_id']}", {"status": "Open"})
+        self.assertEqual((status, updated["status"]), (200, "Open"))
+
+        self.assertEqual((await self.request("PATCH", f"/issues/{issue['issue_id']}", {"status": "In Progress"}))[0], 409)
+        self.assertEqual((await self.request("PATCH", "/issues/missing", {"status": "Open"}))[0], 404)
+        self.assertEqual((await self.request("PATCH", f"/issues/{issue['issue_id']}", {"status": "Bogus"}))[0], 400)
+        self.assertEqual((await self.request("GET", "/issues?colour=red"))[0], 400)
+        self.assertEqual((await self.request("DELETE", "/issues"))[0], 405)
+        self.assertEqual((await self.request("GET", "/nowhere"))[0], 404)
+
+    async def test_full_waitlist_returns_retry_after(self):
+        self.issue_manager.admission_controller = AdmissionController(default_waitlist_limit=0)
+        status, error = await self.request("POST", "/issues", self.issue_body("T1"))
+        self.assertEqual(status, 429)
+        self.assertIn("retry-after", self.last_headers)
+        self.assertEqual(self.issue_manager.get_issues({}), [])
+
+    async def test_negative_content_length_is_rejected(self):
+        self.writer.write(b"POST /issues HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+        await self.writer.drain()
+        self.assertTrue((await self.reader.readline()).startswith(b"HTTP/1.1 400"))
+
+    async def test_close_fails_queued_operations(self):
+        pending = asyncio.create_task(self.service._submit(lambda: (200, {})))
+        await self.service.close()
+        with self.assertRaises(ServiceError) as context:
+            await pending
+        self.assertEqual(context.exception.status, 503)
+        # The idle client connection was closed
+        self.assertEqual(await self.reader.read(), b"")
+
+    async def test_identical_reads_in_a_batch_run_once(self):
+        calls = []
+
+        def read():
+            calls.append("read")
+            return 200, len(calls)
+
+        def write():
+            calls.append("write")
+            return 201, {}
+
+        results = await asyncio.gather(self.service._submit(read, key="k"), self.service._submit(read, key="k"))
+        self.assertEqual(results, [(200, 1), (200, 1)])
+        self.assertEqual(self.service.coalesced_reads, 1)
+
+        # A write between two reads means the second one must run again
+        calls.clear()
+        await asyncio.gather(self.service._submit(read, key="k"), self.service._submit(write),
+                             self.service._submit(read, key="k"))
+        self.assertEqual(calls, ["read", "write", "read"])
+
+    async def test_batches_run_off_the_event_loop(self):
+        started, release = threading.Event(), threading.Event()
+
+        def operation():
+            started.set()
+            return 200, release.wait(5)
+
+        pending = asyncio.create_task(self.service._submit(operation))
+        # The loop keeps running while the batch blocks; a batch on the loop would time out instead
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        release.set()
+        self.assertEqual(await pending, (200, True))
+
+    async def test_concurrent_requests_are_batched(self):
+        port = self.service.server.sockets[0].getsockname()[1]
+
+        async def create(transaction_id):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            payload = json.dumps(self.issue_body(transaction_id)).encode()
+            writer.write(f"POST /issues HTTP/1.1\r\nContent-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload)
+            response = await reader.read()
+            writer.close()
+            return response
+
+        responses = await asyncio.gather(*(create(f"T{i}") for i in range(20)))
+        self.assertTrue(all(response.startswith(b"HTTP/1.1 201") for response in responses))
+        self.assertEqual(len(self.issue_manager.issues), 20)
+        self.assertLess(self.service.batches, 20)
+
+if __name__ == "__main__":
+    unittest.main()
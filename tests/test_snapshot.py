@@ -0,0 +1,142 @@
+import unittest
+import sys
+import threading
+
+try:
+    from admission_control import AdmissionController, AdmissionRejected
+    from agent_manager import AgentManager
+    from issue import IssueStatus
+    from issue_manager import IssueManager
+    from issue_type import IssueType
+    from snapshot import IssueSnapshot, VersionedRecords, take_read_view
+except ImportError:
+    sys.path.insert(0, 'src')
+    from admission_control import AdmissionController, AdmissionRejected
+    from agent_manager import AgentManager
+    from issue import IssueStatus
+    from issue_manager import IssueManager
+    from issue_type import IssueType
+    from snapshot import IssueSnapshot, VersionedRecords, take_read_view
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.issue_manager = IssueManager(dedup_window=None)
+        self.agent_manager = AgentManager()
+        self.agent = self.agent_manager.add_agent("agent@test.com", "Test Agent", [IssueType.PAYMENT_RELATED])
+
+    def create_issue(self, transaction_id="T1"):
+        return self.issue_manager.create_issue(transaction_id, IssueType.PAYMENT_RELATED, "Payment Failed", "Payment failed", "user@test.com")
+
+    def test_snapshot_is_isolated_from_later_changes(self):
+        issue = self.create_issue()
+        self.issue_manager.assign_issue_to_agent(issue, self.agent)
+        view = take_read_view(self.issue_manager, self.agent_manager)
+
+        self.issue_manager.resolve_issue(issue.issue_id, "Refunded")
+        self.create_issue("T2")
+
+        self.assertEqual(len(view.issues), 1)
+        record = view.issues.get_issue_by_id(issue.issue_id)
+        self.assertEqual(record.status, IssueStatus.IN_PROGRESS)
+        self.assertEqual(record.assigned_agent_id, self.agent.agent_id)
+        self.assertEqual(view.agents.get_agent_by_id(self.agent.agent_id).current_issue_id, issue.issue_id)
+        self.assertEqual(view.agents.view_agents_work_history(), {"Test Agent": [issue.issue_id]})
+
+        latest = self.issue_manager.snapshot()
+        self.assertGreater(latest.version, view.issues.version)
+        self.assertEqual(latest.get_issue_by_id(issue.issue_id).status, IssueStatus.RESOLVED)
+
+    def test_agent_history_is_read_as_of_the_snapshot(self):
+        first = self.create_issue("T1")
+        self.issue_manager.assign_issue_to_agent(first, self.agent)
+        self.issue_manager.resolve_issue(first.issue_id, "Refunded")
+        view = take_read_view(self.issue_manager, self.agent_manager)
+
+        second = self.create_issue("T2")
+        self.issue_manager.assign_issue_to_agent(second, self.agent)
+
+        self.assertEqual(view.agents.get_agent_by_id(self.agent.agent_id).work_history, (first.issue_id,))
+        self.assertEqual(self.agent_manager.snapshot().get_agent_by_id(self.agent.agent_id).work_history,
+                         (first.issue_id, second.issue_id))
+
+    def test_snapshot_keeps_removed_issues(self):
+        issue = self.create_issue()
+        self.issue_manager.update_issue(issue.issue_id, IssueStatus.RESOLVED, "Refunded")
+        snapshot = self.issue_manager.snapshot()
+
+        self.issue_manager.compact_partitions(0, now=issue.created_at + 2 * self.issue_manager.PARTITION_SECONDS)
+
+        self.assertEqual(snapshot.get_issue_by_id(issue.issue_id).status, IssueStatus.RESOLVED)
+        self.assertEqual(len(snapshot), 1)
+        self.assertIsNone(self.issue_manager.snapshot().get_issue_by_id(issue.issue_id))
+
+    def test_old_versions_are_pruned_without_snapshots(self):
+        issue = self.create_issue()
+        for status in (IssueStatus.WAITING, IssueStatus.OPEN, IssueStatus.WAITING):
+            self.issue_manager.update_issue(issue.issue_id, status)
+        self.assertEqual(len(self.issue_manager.records.histories[issue.issue_id].versions), 1)
+
+    def test_rejection_cost_does_not_grow_with_stored_issues(self):
+        issue_manager = IssueManager(dedup_window=None, admission_controller=AdmissionController(default_waitlist_limit=0))
+        for i in range(1000):
+            issue_manager.create_issue(f"T{i}", IssueType.PAYMENT_RELATED, "Payment Failed", "Payment failed", "user@test.com")
+        record_log, issue_log = issue_manager.records.log, issue_manager.issue_log
+
+        for i in range(100):
+            issue = issue_manager.create_issue(f"R{i}", IssueType.PAYMENT_RELATED, "Payment Failed", "Payment failed", "user@test.com")
+            with self.assertRaises(AdmissionRejected):
+                issue_manager.add_to_waitlist(issue)
+
+        # Each rejection leaves a tombstone instead of copying logs as long as the number of stored issues
+        self.assertIs(issue_manager.records.log, record_log)
+        self.assertIs(issue_manager.issue_log, issue_log)
+        self.assertEqual(len(issue_manager.records), 1000)
+        self.assertEqual(len(issue_manager.snapshot()), 1000)
+
+    def test_removed_records_are_compacted_in_batches(self):
+        records = VersionedRecords()
+        for key in range(200):
+            records.put(key, f"record {key}")
+        records.remove(range(99))
+        self.assertEqual(len(records.log), 200)
+        records.remove([99])
+        self.assertEqual(len(records.log), 100)
+        self.assertEqual(len(records), 100)
+
+    def test_snapshot_pins_removed_records_during_compaction(self):
+        records = VersionedRecords()
+        for key in range(200):
+            records.put(key, f"record {key}")
+        earlier = IssueSnapshot(records)
+
+        records.remove(range(100))
+
+        self.assertEqual(len(records), 100)
+        self.assertEqual(earlier.get_issue_by_id(0), "record 0")
+        self.assertEqual(len(earlier), 200)
+        self.assertEqual(len(IssueSnapshot(records)), 100)
+
+    def test_reading_snapshot_while_writers_run(self):
+        snapshot = self.issue_manager.snapshot()
+        stop = threading.Event()
+
+        def write():
+            i = 0
+            while not stop.is_set():
+                self.create_issue(f"T{i}")
+                i += 1
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            for _ in range(100):
+                snapshot = self.issue_manager.snapshot()
+                count = len(snapshot)
+                self.assertEqual(len(snapshot.get_issues_by_status(IssueStatus.OPEN)), count)
+        finally:
+            stop.set()
+            writer.join()
+
+if __name__ == "__main__":
+    unittest.main()